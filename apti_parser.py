@@ -1,11 +1,82 @@
 """APT.i Playwright 파서."""
 
 import asyncio
+import contextlib
 import re
+import uuid
 from datetime import datetime
 
 from playwright.async_api import async_playwright
 
+from apti_scripts import EXTRACT_SCRIPT
+from apti_site import BASE_URL, USER_AGENT
+from bill_scheduler import probe_month_http
+from browser_cache import prune_profile
+from checkpoint import Checkpoint, default_checkpoint_path
+from deadline import StepTimeout
+from payment_ledger import PaymentLedger, default_ledger_path
+from rss_monitor import find_pid_by_marker, process_tree_rss
+
+# 영구 프로필을 다른 계정이 이어 쓸 때 지우는 APT.i origin 저장소 (HTTP 캐시는 유지)
+ORIGIN_STORAGE_TYPES = "local_storage,indexeddb,websql,cache_storage,service_workers,file_systems"
+
+# 브라우저 실행 프로필 (launch 인자 + context 옵션)
+LAUNCH_PROFILES = {
+    "default": {
+        "args": [],
+        "context": {"user_agent": USER_AGENT},
+    },
+    # 저사양/고밀도 호스트용: GPU·확장·백그라운드 기능 비활성화, 캐시 제한, 작은 뷰포트
+    "lowmem": {
+        "args": [
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-component-extensions-with-background-pages",
+            "--disable-background-networking",
+            "--disable-background-timer-throttling",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--disable-dev-shm-usage",
+            "--disable-features=Translate,BackForwardCache,MediaRouter,OptimizationHints,AcceptCHFrame",
+            "--no-first-run",
+            "--mute-audio",
+            "--renderer-process-limit=1",
+            "--disk-cache-size=8388608",
+            "--media-cache-size=1",
+            "--js-flags=--max-old-space-size=128",
+        ],
+        "context": {
+            "user_agent": USER_AGENT,
+            "viewport": {"width": 800, "height": 600},
+            "device_scale_factor": 1,
+            "service_workers": "block",
+        },
+    },
+}
+
+
+async def launch_browser(playwright, profile: str = "default", extra_args: tuple[str, ...] = (), contexts: int = 1):
+    """프로필에 맞춰 Chromium 실행.
+
+    contexts: 동시에 띄울 context 수 (2 이상이면 renderer 수 제한을 빼서 context 들이 renderer 하나를
+    나눠 쓰며 직렬화되거나 renderer 하나의 장애로 함께 실패하지 않게 함)
+    """
+    args = [*LAUNCH_PROFILES[profile]["args"], *extra_args]
+    if contexts > 1:
+        args = [a for a in args if not a.startswith("--renderer-process-limit")]
+    return await playwright.chromium.launch(headless=True, args=args)
+
+
+async def launch_persistent(playwright, user_data_dir: str, profile: str = "default", extra_args: tuple[str, ...] = (), cache_mb: int = 64):
+    """영구 프로필로 Chromium 실행 (디스크 캐시 상한 지정, 프로필 args 의 캐시 크기보다 우선, 추출 스크립트 주입)."""
+    args = [*LAUNCH_PROFILES[profile]["args"], *extra_args, f"--disk-cache-size={cache_mb * 1024 * 1024}"]
+    context = await playwright.chromium.launch_persistent_context(
+        user_data_dir, headless=True, args=args, **LAUNCH_PROFILES[profile]["context"]
+    )
+    await context.add_init_script(EXTRACT_SCRIPT)
+    return context
+
 
 def is_phone_number(text: str) -> bool:
     """휴대폰 번호 여부 확인."""
@@ -15,61 +86,243 @@ def is_phone_number(text: str) -> bool:
 class APTiParser:
     """APT.i 파서."""
 
-    BASE_URL = "https://xn--3-v85erd9xh0vctai95f4a637hvqbda945jmkaw30h.apti.co.kr"
+    BASE_URL = BASE_URL
+    # 수집 섹션 (순서대로 _fetch_<name> 호출)
+    SECTIONS = ("dong_ho", "maint", "energy", "history")
 
-    def __init__(self, user_id: str, password: str) -> None:
-        """초기화."""
+    def __init__(
+        self,
+        user_id: str,
+        password: str,
+        profile: str = "default",
+        rss_budget_mb: int | None = None,
+        checkpoint_path: str | None = None,
+        resume: bool = False,
+        section_retries: int = 2,
+        profiler=None,
+        deadline=None,
+        browser=None,
+        full_refresh: bool = False,
+        user_data_dir: str | None = None,
+        cache_mb: int = 64,
+        context=None,
+    ) -> None:
+        """초기화.
+
+        profile: LAUNCH_PROFILES 키 ("default" / "lowmem")
+        rss_budget_mb: 브라우저 프로세스 트리 RSS 상한 (초과 시 context/browser 재시작)
+        checkpoint_path: 섹션별 체크포인트 파일 (기본: .apti_state/checkpoint_<계정해시>.json)
+        resume: 저장된 세션을 재사용하고, 완료되지 않은 최근 체크포인트면 완료 섹션은 복원해 실패 섹션만 재수집
+        section_retries: 섹션별 재시도 횟수
+        profiler: ScrapeProfiler (지정 시 네트워크/성능 지표 기록)
+        deadline: Deadline (지정 시 launch/login/섹션별 시간 예산 적용)
+        browser: 외부에서 실행한 브라우저 공유 (context 만 생성/종료, 브라우저 메모리 관리는 소유자 담당)
+        full_refresh: 납부 원장을 무시하고 납부 내역 전체 재수집
+        user_data_dir: 영구 브라우저 프로필(Chromium user data) 경로 (HTTP/스크립트 캐시를 실행 간 유지, 쿠키는 계정 세션으로 교체)
+        cache_mb: 영구 프로필 캐시 상한 (실행 시 초과분 정리)
+        context: 외부에서 실행한 영구 프로필 context 공유 (user_data_dir 와 함께 지정, 쿠키만 교체하고 종료/메모리 관리는 소유자 담당)
+        """
+        if profile not in LAUNCH_PROFILES:
+            raise ValueError(f"알 수 없는 브라우저 프로필: {profile}")
+        if user_data_dir and browser is not None:
+            raise ValueError("영구 프로필은 공유 브라우저와 함께 쓸 수 없습니다.")
+        if context is not None and not user_data_dir:
+            raise ValueError("공유 context 는 영구 프로필(user_data_dir)과 함께 지정해야 합니다.")
         self.user_id = user_id
         self.password = password
+        self.profile = profile
+        self.rss_budget_mb = rss_budget_mb
+        self.rss_samples: list[dict] = []
+        self.recycles = 0
+        # 사이트 상태 지표 (문서 응답 시간, 5xx/429 응답 수, token 쿠키 확인 결과)
+        self.document_ms: list[float] = []
+        self.http_errors = 0
+        self.login_ok: bool | None = None
+        self.resume = resume
+        self.section_retries = section_retries
+        self.profiler = profiler
+        self.deadline = deadline
+        self.checkpoint = Checkpoint(checkpoint_path or default_checkpoint_path(user_id))
+        self.ledger = PaymentLedger(default_ledger_path(user_id))
+        self.full_refresh = full_refresh
+        self.user_data_dir = user_data_dir
+        self.cache_mb = cache_mb
+        if not resume:
+            self.checkpoint.reset()
+        # 완료됐거나 오래된 체크포인트의 섹션 데이터는 복원하지 않음 (세션만 재사용)
+        self.resume_sections = resume and self.checkpoint.resumable()
+        if resume and not self.resume_sections:
+            if self.checkpoint.state.get("sections"):
+                print("체크포인트가 완료되었거나 오래되어 전체 섹션을 다시 수집합니다.")
+            self.checkpoint.reset_sections()
+        # 브라우저 프로세스 식별용 (Chromium은 모르는 스위치를 무시함)
+        self._marker = f"--apti-instance={uuid.uuid4().hex}"
+        self._browser_pid = None
+        self._owns_browser = browser is None and context is None
         self._playwright = None
-        self._browser = None
+        self._browser = browser
+        self._context = context
         self._page = None
 
+    async def _launch(self) -> None:
+        """프로필에 맞춰 브라우저 실행."""
+        self._browser = await launch_browser(self._playwright, self.profile, (self._marker,))
+        self._browser_pid = None
+
+    async def _new_context(self, storage_state: dict | None = None) -> None:
+        """새 context/page 생성 (storage_state 로 세션 유지 가능)."""
+        if self.user_data_dir:
+            await self._open_persistent(storage_state)
+            return
+        options = dict(LAUNCH_PROFILES[self.profile]["context"])
+        if storage_state:
+            options["storage_state"] = storage_state
+        self._context = await self._browser.new_context(**options)
+        # 모든 페이지에 추출 스크립트 주입 (window.__apti)
+        await self._context.add_init_script(EXTRACT_SCRIPT)
+        self._page = await self._context.new_page()
+        await self._attach_page()
+
+    async def _open_persistent(self, storage_state: dict | None = None) -> None:
+        """영구 프로필 context 실행 (이미 열려 있거나 공유 context 면 세션만 교체).
+
+        프로필의 쿠키와 APT.i origin 저장소(localStorage, IndexedDB 등)는 이전 계정 것일 수 있으므로
+        항상 지우고 이 계정의 세션 쿠키만 넣는다.
+        """
+        if self._context is None:
+            self._context = await launch_persistent(
+                self._playwright, self.user_data_dir, self.profile, (self._marker,), self.cache_mb
+            )
+            self._browser_pid = None
+            self._page = None
+        if self._page is None:
+            self._page = self._context.pages[0] if self._context.pages else await self._context.new_page()
+            await self._attach_page()
+        await self._context.clear_cookies()
+        await self._clear_origin_storage()
+        if storage_state and storage_state.get("cookies"):
+            await self._context.add_cookies(storage_state["cookies"])
+
+    async def _clear_origin_storage(self) -> None:
+        """APT.i origin 의 클라이언트 저장소 삭제 (CDP Storage.clearDataForOrigin)."""
+        session = await self._context.new_cdp_session(self._page)
+        try:
+            await session.send("Storage.clearDataForOrigin", {"origin": self.BASE_URL, "storageTypes": ORIGIN_STORAGE_TYPES})
+        finally:
+            await session.detach()
+
+    async def _reopen_context(self, storage_state: dict | None = None) -> None:
+        """context 재생성 (영구 프로필이면 브라우저째 재시작, 캐시는 디스크에 유지)."""
+        await self._context.close()
+        self._context = None
+        await self._new_context(storage_state)
+
+    async def _attach_page(self) -> None:
+        """페이지 지표 수집/프로파일러 연결."""
+        self._page.on("requestfinished", self._on_request_finished)
+        if self.profiler:
+            await self.profiler.attach(self._context, self._page)
+
+    async def _on_request_finished(self, request) -> None:
+        """APT.i 문서 응답 시간/오류 응답 기록."""
+        if request.resource_type != "document" or "apti.co.kr" not in request.url:
+            return
+        response_end = request.timing.get("responseEnd", -1)
+        if response_end >= 0:
+            self.document_ms.append(response_end)
+        response = await request.response()
+        if response and (response.status >= 500 or response.status == 429):
+            self.http_errors += 1
+
     async def _init_browser(self) -> None:
-        """브라우저 초기화."""
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=True)
-        context = await self._browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        )
-        self._page = await context.new_page()
+        """브라우저 초기화 (공유 브라우저면 context 만 생성, 영구 프로필이면 캐시 정리 후 실행)."""
+        if self._owns_browser:
+            self._playwright = await async_playwright().start()
+            if self.user_data_dir:
+                pruned = prune_profile(self.user_data_dir, self.cache_mb)
+                if pruned:
+                    print(f"브라우저 캐시 정리: {pruned['removed']}개 파일, {pruned['freed_mb']}MB 삭제 (현재 {pruned['size_mb']}MB)")
+            else:
+                await self._launch()
+        await self._new_context()
 
     async def _close_browser(self) -> None:
-        """브라우저 종료."""
+        """브라우저 종료 (프로파일러 사용 시 결과 저장)."""
+        if self.profiler:
+            print(f"프로파일 저장: {self.profiler.write()}")
+            self.profiler.print_summary()
+        if not self._owns_browser:
+            if self.user_data_dir:
+                # 공유 영구 프로필 context 는 닫지 않고 이 계정의 흔적만 제거 (sessionStorage 는 탭 단위라 탭을 닫음,
+                # origin 저장소는 다음 계정이 새 탭을 열 때 _open_persistent 에서 삭제)
+                if self._page:
+                    await self._page.close()
+                    self._page = None
+                await self._context.clear_cookies()
+            elif self._context:
+                await self._context.close()
+            return
+        if self.user_data_dir and self._context:
+            await self._context.close()
         if self._browser:
             await self._browser.close()
         if self._playwright:
             await self._playwright.stop()
 
+    def browser_rss_mb(self) -> float | None:
+        """브라우저 프로세스 트리 RSS (MB). 측정 불가 시 None."""
+        if self._browser_pid is None:
+            self._browser_pid = find_pid_by_marker(self._marker)
+        if self._browser_pid is None:
+            return None
+        rss = process_tree_rss(self._browser_pid)
+        return rss / (1024 * 1024) if rss is not None else None
+
+    async def _enforce_memory_budget(self, step: str) -> None:
+        """RSS 상한 초과 시 context → browser 순으로 재시작 (세션은 storage_state 로 유지)."""
+        # 공유 영구 프로필 context 는 소유자가 계정 사이에 재시작
+        if not self.rss_budget_mb or (self.user_data_dir and not self._owns_browser):
+            return
+        rss = self.browser_rss_mb()
+        self.rss_samples.append({"step": step, "rss_mb": rss})
+        if rss is None or rss <= self.rss_budget_mb:
+            return
+
+        print(f"브라우저 메모리 {rss:.0f}MB > 상한 {self.rss_budget_mb}MB, context 재시작")
+        storage_state = await self._context.storage_state()
+        await self._reopen_context(storage_state)
+        self.recycles += 1
+
+        rss = self.browser_rss_mb()
+        if self._owns_browser and not self.user_data_dir and rss is not None and rss > self.rss_budget_mb:
+            print(f"context 재시작 후에도 {rss:.0f}MB, 브라우저 재시작")
+            await self._browser.close()
+            await self._launch()
+            await self._new_context(storage_state)
+            self.recycles += 1
+
+    async def _extract(self, section: str, **opts) -> dict:
+        """주입된 추출 스크립트로 섹션 데이터를 한 번에 수집."""
+        payload = await self._page.evaluate(
+            "([section, opts]) => window.__apti.extract(section, opts)", [section, opts]
+        )
+        meta = payload.pop("__meta", None)
+        if self.profiler and meta:
+            self.profiler.record_extract(meta)
+        return payload
+
     async def login(self) -> bool:
         """로그인."""
         print("로그인 시도 중...")
         await self._page.goto(f"{self.BASE_URL}/aptHome/", wait_until="networkidle")
         await asyncio.sleep(2)  # 페이지 로딩 대기
-        
-        if is_phone_number(self.user_id):
-            await self._page.evaluate("""() => {
-                document.querySelectorAll('.hideHP').forEach(el => el.style.display = '');
-                document.querySelectorAll('.hideID').forEach(el => el.style.display = 'none');
-            }""")
-            await asyncio.sleep(1)  # UI 전환 대기
-            
-            # evaluate로 직접 값 설정 (hidden 요소도 가능)
-            await self._page.evaluate(f"""() => {{
-                const hpId = document.querySelector("input[name='hp_id']");
-                const hpPwd = document.querySelector("input[name='hp_pwd']");
-                if (hpId) hpId.value = "{self.user_id}";
-                if (hpPwd) hpPwd.value = "{self.password}";
-            }}""")
-            await self._page.evaluate("loginHtml('H')")
-        else:
-            await self._page.evaluate(f"""() => {{
-                const loginId = document.querySelector("input[name='login_id']");
-                const loginPwd = document.querySelector("input[name='login_pwd']");
-                if (loginId) loginId.value = "{self.user_id}";
-                if (loginPwd) loginPwd.value = "{self.password}";
-            }}""")
-            await self._page.evaluate("loginHtml('I')")
+
+        # 휴대폰 번호면 HP 로그인, 아니면 ID 로그인 (값은 인자로 전달하여 문자열 삽입 방지)
+        mode = "H" if is_phone_number(self.user_id) else "I"
+        await self._page.evaluate(
+            "([mode, userId, password]) => window.__apti.login(mode, userId, password)",
+            [mode, self.user_id, self.password],
+        )
 
         await asyncio.sleep(3)  # 로그인 처리 대기
         await self._page.wait_for_load_state("networkidle")
@@ -78,14 +331,114 @@ class APTiParser:
         cookies = await self._page.context.cookies()
         login_success = any("token" in c["name"].lower() for c in cookies)
         
+        self.login_ok = login_success
         if login_success:
             print("로그인 성공")
             return True
         print("로그인 실패 가능성 있음")
         return False
 
+    async def _fetch_dong_ho(self) -> dict:
+        """1. 동호 정보."""
+        print("동호 정보 수집 중...")
+        await self._page.goto(f"{self.BASE_URL}/aptHome/subpage/?cate_code=AAEB", wait_until="networkidle")
+        dong_ho_text = (await self._extract("dong_ho"))["dong_ho_text"]
+        if not dong_ho_text:
+            raise RuntimeError("동호 정보 없음 (로그인 페이지일 수 있음)")
+
+        # 동호 텍스트에서 숫자 추출 (예: "1306동 1001호" -> "13061001")
+        dong_ho = dong_ho_text
+        match = re.search(r"(\d+)동\s*(\d+)호", dong_ho_text)
+        if match:
+            dong_ho = match.group(1).zfill(4) + match.group(2).zfill(4)
+        print(f"동호: {dong_ho}")
+        return {"dong_ho": dong_ho}
+
+    async def _fetch_maint(self) -> dict:
+        """2. 관리비 항목 & 납부액 (더보기 2회 클릭까지 페이지 내부에서 처리)."""
+        print("관리비 정보 수집 중...")
+        await self._page.goto(f"{self.BASE_URL}/apti/manage/manage_cost.asp?cate_code=AAEB", wait_until="networkidle")
+        await asyncio.sleep(2)  # 페이지 로딩 대기
+        maint = await self._extract("maint", more=2)
+        if not maint["maint_payment"].get("amount"):
+            raise RuntimeError("청구 금액 없음 (로그인 페이지일 수 있음)")
+        print(f"더보기 버튼 클릭 {maint['more_clicks']}회 완료")
+        print(f"관리비 항목: {len(maint['maint_items'])}개")
+        return {"maint_payment": maint["maint_payment"], "maint_items": maint["maint_items"]}
+
+    async def _fetch_energy(self) -> dict:
+        """3. 에너지 카테고리 (비교 문구 포함)."""
+        print("에너지 카테고리 수집 중...")
+        await self._page.goto(f"{self.BASE_URL}/apti/manage/manage_energy.asp?cate_code=AAEC", wait_until="networkidle")
+        await asyncio.sleep(1)  # 페이지 로딩 대기
+        energy = await self._extract("energy")
+        print(f"에너지 카테고리: {len(energy['energy_category'])}개")
+        return energy
+
+    async def _fetch_history(self) -> dict:
+        """4. 납부 내역 (원장의 마지막 납부 이후 행만 추출해 원장에 병합)."""
+        print("납부내역 수집 중...")
+        await self._page.goto(f"{self.BASE_URL}/apti/manage/manage_check.asp?cate_code=AAFH", wait_until="networkidle")
+        stop_at = None if self.full_refresh else self.ledger.last_known
+        history = await self._extract("history", stop_at=stop_at)
+        rows = history["payment_history"]
+        if stop_at and not rows and not history["stopped"]:
+            # 알고 있는 납부 행도 보이지 않으면 표 자체가 없는 것 (세션 만료 등)
+            raise RuntimeError("납부내역 표를 찾지 못함 (로그인 페이지일 수 있음)")
+        if stop_at is None and rows:
+            self.ledger.replace(rows)
+            added = len(rows)
+        else:
+            # stop_at 을 못 찾았으면 (원장이 오래됨) 표 전체가 반환되므로 중복만 제외하고 병합
+            added = self.ledger.merge(rows)
+        print(f"납부내역: 신규 {added}건 / 전체 {len(self.ledger.rows)}건" + ("" if stop_at else " (전체 수집)"))
+        return {
+            "payment_history": self.ledger.rows,
+            "payment_history_sync": {"new": added, "full_refresh": stop_at is None, "stopped_at_known": history["stopped"]},
+        }
+
+    def _profile(self, name: str, attempt: int = 1):
+        """프로파일러 구간 (미사용 시 빈 컨텍스트)."""
+        return self.profiler.section(name, attempt) if self.profiler else contextlib.nullcontext()
+
+    @contextlib.asynccontextmanager
+    async def _step(self, name: str):
+        """deadline 단계 (미사용 시 제한 없음). 페이지 기본 타임아웃도 단계 예산으로 제한."""
+        if not self.deadline:
+            yield
+            return
+        async with self.deadline.step(name) as budget:
+            if self._page:
+                self._page.set_default_timeout(budget * 1000)
+            yield
+
+    async def _fetch_section(self, name: str) -> dict | None:
+        """섹션 하나를 재시도하며 수집하고 체크포인트에 기록 (실패 시 None)."""
+        fetch = getattr(self, f"_fetch_{name}")
+        attempts = 0
+        last_error = ""
+        try:
+            async with self._step(name):
+                while attempts <= self.section_retries:
+                    attempts += 1
+                    try:
+                        async with self._profile(name, attempts):
+                            result = await fetch()
+                        self.checkpoint.mark_done(name, result, attempts)
+                        return result
+                    except Exception as e:
+                        last_error = f"{type(e).__name__}: {e}"
+                        print(f"[{name}] 수집 실패 ({attempts}/{self.section_retries + 1}회): {last_error}")
+                        if attempts <= self.section_retries:
+                            await asyncio.sleep(2 * attempts)  # 재시도 전 대기
+        except StepTimeout as e:
+            last_error = str(e)
+            print(f"[{name}] {last_error}")
+        self.checkpoint.mark_failed(name, last_error, attempts)
+        return None
+
     async def fetch_all_data(self) -> dict:
-        """모든 데이터 수집."""
+        """모든 데이터 수집 (섹션별 체크포인트, resume 시 완료 섹션은 건너뜀)."""
         data = {
             "timestamp": datetime.now().isoformat(),
             "dong_ho": "",
@@ -94,188 +447,100 @@ class APTiParser:
             "energy_category": [],
             "payment_history": [],
         }
+        failed = []
+
+        for name in self.SECTIONS:
+            if self.resume_sections and self.checkpoint.is_done(name):
+                print(f"[{name}] 체크포인트에서 복원")
+                if self.deadline:
+                    self.deadline.skip(name)
+                data.update(self.checkpoint.section_data(name))
+                continue
+            result = await self._fetch_section(name)
+            if result is None:
+                failed.append(name)
+            else:
+                data.update(result)
+            await self._enforce_memory_budget(name)
 
+        if failed:
+            data["failed_sections"] = failed
+            data["incomplete"] = True
+            print(f"실패한 섹션: {', '.join(failed)} (--resume 으로 재수집 가능)")
+        else:
+            self.checkpoint.mark_complete()
+        return data
+
+    async def _session_alive(self) -> bool:
+        """로그인 상태 확인 (동호 정보가 보이면 로그인됨, 로그인 페이지로 가면 비어 있음)."""
         try:
-            # 1. 동호 정보
-            print("동호 정보 수집 중...")
             await self._page.goto(f"{self.BASE_URL}/aptHome/subpage/?cate_code=AAEB", wait_until="networkidle")
-            dong_ho_text = await self._page.evaluate("""() => {
-                const el = document.querySelector('div.Nbox1_txt10');
-                return el ? el.textContent.trim() : '';
-            }""")
-            
-            # 동호 텍스트에서 숫자 추출 (예: "1306동 1001호" -> "13061001")
-            if dong_ho_text:
-                match = re.search(r"(\d+)동\s*(\d+)호", dong_ho_text)
-                if match:
-                    dong = match.group(1).zfill(4)
-                    ho = match.group(2).zfill(4)
-                    data["dong_ho"] = dong + ho
-                else:
-                    data["dong_ho"] = dong_ho_text
-            print(f"동호: {data['dong_ho']}")
-
-            # 2. 관리비 항목 & 납부액
-            print("관리비 정보 수집 중...")
-            await self._page.goto(f"{self.BASE_URL}/apti/manage/manage_cost.asp?cate_code=AAEB", wait_until="networkidle")
-            await asyncio.sleep(2)  # 페이지 로딩 대기
-            
-            # 납부액 및 기본 정보
-            data["maint_payment"] = await self._page.evaluate("""() => {
-                const res = {};
-                const costPay = document.querySelector('span.costPay');
-                if (costPay) res['amount'] = costPay.textContent.trim().replace(/,/g, '');
-                
-                const dts = document.querySelectorAll('div.costpayBox dt');
-                dts.forEach(dt => {
-                   if(dt.textContent.includes('월분')) {
-                       const match = dt.textContent.match(/(\\d+)월분/);
-                       if(match) res['month'] = match[1];
-                   } 
-                });
-                
-                const deadline = document.querySelector('div.endBox span');
-                if(deadline) res['deadline'] = deadline.textContent.trim();
-                
-                const status = document.querySelector('div.dayBox p');
-                if(status) res['status'] = status.textContent.trim();
-                
-                return res;
-            }""")
-
-            # 더보기 버튼 2번 클릭하여 모든 항목 로드
-            print("더보기 버튼 클릭 중...")
-            for i in range(2):
-                try:
-                    # 더보기 버튼 찾기 및 클릭
-                    more_button_clicked = await self._page.evaluate("""() => {
-                        const moreBtn = document.querySelector('a[onclick*="ajaxTempData"][alt="더보기"]');
-                        if (moreBtn) {
-                            moreBtn.click();
-                            return true;
-                        }
-                        return false;
-                    }""")
-                    
-                    if more_button_clicked:
-                        print(f"더보기 버튼 클릭 {i+1}회 완료")
-                        await asyncio.sleep(2)  # 데이터 로딩 대기
-                    else:
-                        print(f"더보기 버튼을 찾을 수 없습니다 (클릭 {i+1}회 시도)")
-                        break
-                except Exception as e:
-                    print(f"더보기 버튼 클릭 중 오류: {e}")
-                    break
-            
-            await asyncio.sleep(1)  # 최종 로딩 대기
-
-            # 상세 항목 리스트 (모든 항목 파싱)
-            data["maint_items"] = await self._page.evaluate("""() => {
-                const items = [];
-                document.querySelectorAll('a.black').forEach(link => {
-                    const row = link.closest('tr');
-                    const tds = row.querySelectorAll('td');
-                    if(tds.length >= 4) {
-                        items.push({
-                            'item': link.textContent.trim(),
-                            'current': tds[1].textContent.trim().replace(/,/g, ''),
-                            'previous': tds[2].textContent.trim().replace(/,/g, ''),
-                            'change': tds[3].textContent.trim().replace(/,/g, '')
-                        });
-                    }
-                });
-                return items;
-            }""")
-            print(f"관리비 항목: {len(data['maint_items'])}개")
-
-            # 3. 에너지 카테고리 (비교 문구 포함)
-            print("에너지 카테고리 수집 중...")
-            await self._page.goto(f"{self.BASE_URL}/apti/manage/manage_energy.asp?cate_code=AAEC", wait_until="networkidle")
-            await asyncio.sleep(1)  # 페이지 로딩 대기
-            data["energy_category"] = await self._page.evaluate("""() => {
-                const res = [];
-                document.querySelectorAll('div.engBox').forEach(box => {
-                    const h3 = box.querySelector('h3');
-                    if (!h3) return;
-                    const type = h3.textContent.replace(/[\\n\\t]/g, '').trim();
-                    if(!type) return;
-                    
-                    let usage = '0', cost = '0', comparison = '';
-                    const engUnit = box.querySelector('ul.engUnit');
-                    if (engUnit) {
-                        const lis = engUnit.querySelectorAll('li');
-                        let foundLine = false;
-                        for (const li of lis) {
-                            if (li.classList.contains('line')) { 
-                                foundLine = true; 
-                                continue; 
-                            }
-                            const strong = li.querySelector('strong');
-                            if (strong) {
-                                const text = strong.textContent.trim();
-                                if (!foundLine) {
-                                    usage = text.replace(/,/g, '');
-                                } else {
-                                    cost = text.replace(/,/g, '').replace('원', '');
-                                }
-                            }
-                        }
-                    }
-                    const txtBox = box.querySelector('div.txtBox');
-                    if (txtBox) {
-                        const compElem = txtBox.querySelector('strong');
-                        if (compElem) comparison = compElem.textContent.trim();
-                    }
-                    res.push({ type, usage, cost, comparison });
-                });
-                return res;
-            }""")
-            print(f"에너지 카테고리: {len(data['energy_category'])}개")
-
-            # 4. 납부 내역
-            print("납부내역 수집 중...")
-            await self._page.goto(f"{self.BASE_URL}/apti/manage/manage_check.asp?cate_code=AAFH", wait_until="networkidle")
-            data["payment_history"] = await self._page.evaluate("""() => {
-                const res = [];
-                const table = document.querySelector('table.table-w') || document.querySelector('div#hidden-xs2 table.table-w');
-                if (table) {
-                    const tbody = table.querySelector('tbody');
-                    if (tbody) {
-                        tbody.querySelectorAll('tr').forEach(tr => {
-                            const tds = tr.querySelectorAll('td');
-                            if(tds.length >= 7) {
-                                const dateText = tds[0].textContent.trim();
-                                if(dateText && dateText.match(/\\d{4}\\.\\d{2}\\.\\d{2}/)) {
-                                    res.push({
-                                        date: dateText,
-                                        amount: tds[1].textContent.trim().replace(/,/g, ''),
-                                        billing_month: tds[2].textContent.trim(),
-                                        deadline: tds[3].textContent.trim(),
-                                        bank: tds[4].textContent.trim(),
-                                        method: tds[5].textContent.trim(),
-                                        status: tds[6].textContent.trim()
-                                    });
-                                }
-                            }
-                        });
-                    }
-                }
-                return res;
-            }""")
-            print(f"납부내역: {len(data['payment_history'])}건")
-
+            return bool((await self._extract("dong_ho"))["dong_ho_text"])
         except Exception as e:
-            print(f"Data Fetch Error: {e}")
-            import traceback
-            traceback.print_exc()
-        
-        return data
+            print(f"세션 확인 실패: {e}")
+            return False
+
+    async def _restore_session(self) -> bool:
+        """체크포인트의 세션으로 context 재생성 (토큰 쿠키가 있고 실제로 로그인 상태일 때만)."""
+        storage_state = self.checkpoint.storage_state
+        if not storage_state:
+            return False
+        now = datetime.now().timestamp()
+        valid = any(
+            "token" in c["name"].lower() and (c.get("expires", -1) < 0 or c["expires"] > now)
+            for c in storage_state.get("cookies", [])
+        )
+        if not valid:
+            return False
+        if self.user_data_dir:
+            await self._open_persistent(storage_state)
+        else:
+            await self._reopen_context(storage_state)
+        if not await self._session_alive():
+            print("저장된 세션 만료, 다시 로그인")
+            # 만료된 token 쿠키가 남아 있으면 로그인 성공 판정이 틀어지므로 제거
+            await self._context.clear_cookies()
+            return False
+        print("저장된 세션 재사용")
+        return True
+
+    async def probe_month(self) -> str | None:
+        """청구월만 확인 (저장된 세션으로 HTTP 요청, 실패 시 브라우저 로그인 후 확인)."""
+        storage_state = self.checkpoint.storage_state
+        if storage_state:
+            month = await asyncio.to_thread(probe_month_http, self.BASE_URL, storage_state)
+            if month:
+                print(f"세션 재사용 probe: {month}월분")
+                return month
+
+        print("세션 없음/만료, 브라우저로 확인")
+        try:
+            await self._init_browser()
+            if not await self.login():
+                return None
+            self.checkpoint.storage_state = await self._context.storage_state()
+            await self._page.goto(
+                f"{self.BASE_URL}/apti/manage/manage_cost.asp?cate_code=AAEB", wait_until="domcontentloaded"
+            )
+            return (await self._extract("month"))["month"] or None
+        finally:
+            await self._close_browser()
 
     async def run(self) -> dict | None:
         """실행."""
         try:
-            await self._init_browser()
-            if await self.login():
+            async with self._step("launch"):
+                await self._init_browser()
+            if self.resume and await self._restore_session():
+                logged_in = True
+                if self.deadline:
+                    self.deadline.skip("login")
+            else:
+                async with self._step("login"), self._profile("login"):
+                    logged_in = await self.login()
+                if logged_in:
+                    self.checkpoint.storage_state = await self._context.storage_state()
+            if logged_in:
                 print("데이터 수집 시작...")
                 data = await self.fetch_all_data()
                 print("데이터 수집 완료!")
@@ -284,6 +549,10 @@ class APTiParser:
             print("로그인 실패로 데이터 수집 불가")
             await self._close_browser()
             return None
+        except StepTimeout as e:
+            print(f"시간 예산 초과로 중단: {e}")
+            await self._close_browser()
+            return None
         except Exception as e:
             print(f"파싱 중 오류 발생: {e}")
             import traceback
@@ -0,0 +1,186 @@
+"""APT.i 페이지 추출 스크립트 (add_init_script 주입용)."""
+
+# 셀렉터/파싱 로직 변경 시 버전을 올린다 (페이지에서 window.__apti.version 으로 확인)
+EXTRACT_SCRIPT_VERSION = 3
+
+EXTRACT_SCRIPT = """
+(() => {
+    const VERSION = %(version)d;
+    if (window.__apti && window.__apti.version === VERSION) return;
+
+    const text = (el) => (el ? el.textContent.trim() : '');
+    const num = (s) => s.replace(/,/g, '');
+    const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
+
+    function dongHo() {
+        return { dong_ho_text: text(document.querySelector('div.Nbox1_txt10')) };
+    }
+
+    function maintPayment() {
+        const res = {};
+        const costPay = document.querySelector('span.costPay');
+        if (costPay) res['amount'] = num(text(costPay));
+
+        document.querySelectorAll('div.costpayBox dt').forEach((dt) => {
+            if (dt.textContent.includes('월분')) {
+                const match = dt.textContent.match(/(\\d+)월분/);
+                if (match) res['month'] = match[1];
+            }
+        });
+
+        const deadline = document.querySelector('div.endBox span');
+        if (deadline) res['deadline'] = text(deadline);
+
+        const status = document.querySelector('div.dayBox p');
+        if (status) res['status'] = text(status);
+
+        return res;
+    }
+
+    function maintItems() {
+        const items = [];
+        document.querySelectorAll('a.black').forEach((link) => {
+            const row = link.closest('tr');
+            if (!row) return;
+            const tds = row.querySelectorAll('td');
+            if (tds.length >= 4) {
+                items.push({
+                    item: text(link),
+                    current: num(text(tds[1])),
+                    previous: num(text(tds[2])),
+                    change: num(text(tds[3])),
+                });
+            }
+        });
+        return items;
+    }
+
+    // 더보기 버튼 클릭 후 행 수가 늘어날 때까지 대기 (페이지 내부에서 처리)
+    async function expandMore(times, timeoutMs) {
+        let clicks = 0;
+        for (let i = 0; i < times; i++) {
+            const moreBtn = document.querySelector('a[onclick*="ajaxTempData"][alt="더보기"]');
+            if (!moreBtn) break;
+            const before = document.querySelectorAll('a.black').length;
+            moreBtn.click();
+            clicks++;
+            const started = Date.now();
+            while (Date.now() - started < timeoutMs) {
+                await sleep(100);
+                if (document.querySelectorAll('a.black').length > before) break;
+            }
+        }
+        return clicks;
+    }
+
+    async function maint(opts) {
+        const more = opts.more === undefined ? 2 : opts.more;
+        const clicks = await expandMore(more, opts.more_timeout_ms || 2000);
+        return { maint_payment: maintPayment(), maint_items: maintItems(), more_clicks: clicks };
+    }
+
+    function energy() {
+        const res = [];
+        document.querySelectorAll('div.engBox').forEach((box) => {
+            const h3 = box.querySelector('h3');
+            if (!h3) return;
+            const type = h3.textContent.replace(/[\\n\\t]/g, '').trim();
+            if (!type) return;
+
+            let usage = '0', cost = '0', comparison = '';
+            const engUnit = box.querySelector('ul.engUnit');
+            if (engUnit) {
+                let foundLine = false;
+                for (const li of engUnit.querySelectorAll('li')) {
+                    if (li.classList.contains('line')) {
+                        foundLine = true;
+                        continue;
+                    }
+                    const strong = li.querySelector('strong');
+                    if (strong) {
+                        const t = text(strong);
+                        if (!foundLine) {
+                            usage = num(t);
+                        } else {
+                            cost = num(t).replace('원', '');
+                        }
+                    }
+                }
+            }
+            const txtBox = box.querySelector('div.txtBox');
+            if (txtBox) comparison = text(txtBox.querySelector('strong'));
+            res.push({ type, usage, cost, comparison });
+        });
+        return { energy_category: res };
+    }
+
+    // 최신순 표를 위에서부터 읽다가 opts.stop_at (마지막으로 알고 있는 납부) 에서 중단
+    function history(opts) {
+        const res = [];
+        const stopAt = opts.stop_at;
+        let stopped = false;
+        const table = document.querySelector('table.table-w') || document.querySelector('div#hidden-xs2 table.table-w');
+        const tbody = table ? table.querySelector('tbody') : null;
+        if (tbody) {
+            for (const tr of tbody.querySelectorAll('tr')) {
+                const tds = tr.querySelectorAll('td');
+                if (tds.length < 7) continue;
+                const dateText = text(tds[0]);
+                if (!dateText || !dateText.match(/\\d{4}\\.\\d{2}\\.\\d{2}/)) continue;
+                const row = {
+                    date: dateText,
+                    amount: num(text(tds[1])),
+                    billing_month: text(tds[2]),
+                    deadline: text(tds[3]),
+                    bank: text(tds[4]),
+                    method: text(tds[5]),
+                    status: text(tds[6]),
+                };
+                if (stopAt && row.date === stopAt.date && row.billing_month === stopAt.billing_month && row.amount === stopAt.amount) {
+                    stopped = true;
+                    break;
+                }
+                res.push(row);
+            }
+        }
+        return { payment_history: res, stopped };
+    }
+
+    // 고지 여부 확인용: costpayBox 월분 텍스트만 읽음 (더보기 클릭 없음)
+    function month() {
+        return { month: maintPayment().month || '' };
+    }
+
+    const SECTIONS = { dong_ho: dongHo, maint, energy, history, month };
+
+    async function login(mode, userId, password) {
+        if (mode === 'H') {
+            document.querySelectorAll('.hideHP').forEach((el) => (el.style.display = ''));
+            document.querySelectorAll('.hideID').forEach((el) => (el.style.display = 'none'));
+            const hpId = document.querySelector("input[name='hp_id']");
+            const hpPwd = document.querySelector("input[name='hp_pwd']");
+            if (hpId) hpId.value = userId;
+            if (hpPwd) hpPwd.value = password;
+        } else {
+            const loginId = document.querySelector("input[name='login_id']");
+            const loginPwd = document.querySelector("input[name='login_pwd']");
+            if (loginId) loginId.value = userId;
+            if (loginPwd) loginPwd.value = password;
+        }
+        if (typeof window.loginHtml !== 'function') return false;
+        window.loginHtml(mode);
+        return true;
+    }
+
+    async function extract(section, opts) {
+        const fn = SECTIONS[section];
+        if (!fn) throw new Error('unknown section: ' + section);
+        const started = performance.now();
+        const payload = await fn(opts || {});
+        payload.__meta = { section, version: VERSION, elapsed_ms: Math.round(performance.now() - started) };
+        return payload;
+    }
+
+    window.__apti = { version: VERSION, extract, login, sections: Object.keys(SECTIONS) };
+})();
+""" % {"version": EXTRACT_SCRIPT_VERSION}
@@ -0,0 +1,12 @@
+"""APT.i 사이트 상수 (playwright 없이 import 할 수 있도록 파서와 분리)."""
+
+import os
+from urllib.parse import urlparse
+
+BASE_URL = "https://xn--3-v85erd9xh0vctai95f4a637hvqbda945jmkaw30h.apti.co.kr"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+def default_complex_key() -> str:
+    """단지 식별자 기본값 (APTI_COMPLEX, 없으면 APT.i 단지 호스트명) - 게시일 스케줄러와 집계가 같은 키를 씀."""
+    return os.environ.get("APTI_COMPLEX") or urlparse(BASE_URL).hostname
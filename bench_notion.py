@@ -0,0 +1,158 @@
+"""NotionSender 업로드 처리량/정합성 벤치마크 (로컬 Notion 대역 서버 사용, 네트워크 불필요).
+
+    python bench_notion.py apti_result_xxx.json --pages 20 --rate 3 --seed-pages 250
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from notion_client import APIResponseError
+
+from billing import billing_period
+from mock_notion import MAX_CHILDREN_PER_REQUEST, MAX_TEXT_LENGTH, MockNotion, MockNotionServer
+from notion_schema import SchemaCache
+from notion_sender import NotionSender
+
+
+def make_sender(server: MockNotionServer, database_id: str, layout: str, max_retries: int, cache_dir: str) -> NotionSender:
+    """대역 서버를 바라보는 NotionSender (스키마 캐시는 임시 디렉터리)."""
+    sender = NotionSender("mock-token", database_id, render_mode=layout, base_url=server.base_url, max_retries=max_retries)
+    sender.schema_cache = SchemaCache(database_id, path=os.path.join(cache_dir, f"schema_{layout}.json"))
+    return sender
+
+
+def check_limits(sender: NotionSender, page_id: str) -> list[tuple[str, bool]]:
+    """대역 서버가 Notion 제한을 거부하는지 확인."""
+    paragraph = {"object": "block", "type": "paragraph", "paragraph": {"rich_text": [{"type": "text", "text": {"content": "x"}}]}}
+    long_text = {"object": "block", "type": "paragraph",
+                 "paragraph": {"rich_text": [{"type": "text", "text": {"content": "x" * (MAX_TEXT_LENGTH + 1)}}]}}
+    nested = paragraph
+    for _ in range(3):
+        nested = {"object": "block", "type": "toggle", "toggle": {"rich_text": [], "children": [nested]}}
+    cases = [
+        (f"children {MAX_CHILDREN_PER_REQUEST + 1}개 거부", [paragraph] * (MAX_CHILDREN_PER_REQUEST + 1)),
+        (f"텍스트 {MAX_TEXT_LENGTH + 1}자 거부", [long_text]),
+        ("중첩 3단계 거부", [nested]),
+    ]
+    results = []
+    for name, children in cases:
+        try:
+            sender.notion.blocks.children.append(block_id=page_id, children=children)
+            results.append((name, False))
+        except APIResponseError as e:
+            results.append((name, e.code == "validation_error"))
+    return results
+
+
+def run_layout(server: MockNotionServer, database_id: str, data: dict, layout: str, pages: int, max_retries: int, cache_dir: str) -> dict:
+    """레이아웃 하나로 pages 건 업로드 후 처리량/정합성 집계."""
+    notion = server.notion
+    sender = make_sender(server, database_id, layout, max_retries, cache_dir)
+    year, month = billing_period(data)
+    before_pages = set(notion.pages)
+    before_requests = notion.stats["requests"]
+    before_limited = notion.stats["rate_limited"]
+
+    exists_before = sender.check_month_exists(year, month)
+    latencies, failures = [], 0
+    started = time.perf_counter()
+    for _ in range(pages):
+        t0 = time.perf_counter()
+        if not sender.update_or_create_page(data):
+            failures += 1
+        latencies.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - started
+    exists_after = sender.check_month_exists(year, month)
+
+    created = [p for p in notion.pages if p not in before_pages]
+    block_counts = [notion.count_descendants(p) for p in created]
+    return {
+        "layout": layout,
+        "pages": len(created),
+        "failures": failures,
+        "wall_s": round(wall, 2),
+        "pages_per_s": round(len(created) / wall, 2) if wall else 0.0,
+        "p50_s": round(statistics.median(latencies), 3) if latencies else None,
+        "p95_s": round(sorted(latencies)[int(len(latencies) * 0.95) - 1], 3) if latencies else None,
+        "requests": notion.stats["requests"] - before_requests,
+        "rate_limited": notion.stats["rate_limited"] - before_limited,
+        "client": dict(sender.notion.stats),
+        "blocks_per_page": sorted(set(block_counts)),
+        "dedup_check": {"before": exists_before, "after": exists_after},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="NotionSender 업로드 벤치마크 (로컬 대역 서버)")
+    parser.add_argument("file", nargs="?", help="수집 결과 JSON (기본: 최신 apti_result_*.json)")
+    parser.add_argument("--pages", type=int, default=10, help="레이아웃별 업로드 페이지 수")
+    parser.add_argument("--layouts", default="rich,compact")
+    parser.add_argument("--rate", type=float, default=3.0, help="대역 서버 초당 허용 요청 수 (0: 제한 없음)")
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--retry-after", type=int, help="429 Retry-After 초 고정값")
+    parser.add_argument("--latency-ms", type=float, default=0, help="요청별 서버 지연")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--seed-pages", type=int, default=250, help="중복 확인 페이지네이션 검증용 같은 월 과거 페이지 수")
+    parser.add_argument("-o", "--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    path = args.file or max(glob.glob("apti_result_*.json"), default=None)
+    if not path:
+        parser.error("수집 결과 JSON 이 없습니다.")
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    year, month = billing_period(data)
+
+    notion = MockNotion(args.rate, args.burst, args.retry_after, args.latency_ms)
+    report = {"input": path, "server": {"rate": args.rate, "burst": args.burst}, "layouts": [], "limits": []}
+    with MockNotionServer(notion) as server, tempfile.TemporaryDirectory() as cache_dir:
+        for layout in args.layouts.split(","):
+            database_id = notion.add_database()
+            # 같은 청구월의 과거 연도 페이지 (중복 확인이 여러 페이지를 넘겨야 찾을 수 있게 먼저 채움)
+            for i in range(args.seed_pages):
+                notion.seed_page(database_id, {
+                    "Name": {"title": [{"type": "text", "text": {"content": f"{year - 1 - i}년 {month}월 관리비"}}]},
+                    "청구월": {"number": month},
+                })
+            print(f"[{layout}] {args.pages}페이지 업로드 중...")
+            report["layouts"].append(run_layout(server, database_id, data, layout, args.pages, args.max_retries, cache_dir))
+
+        sender = make_sender(server, database_id, "compact", args.max_retries, cache_dir)
+        page_id = next(iter(notion.pages))
+        report["limits"] = check_limits(sender, page_id)
+        report["server"]["errors"] = dict(notion.stats["errors"])
+        # 제한 확인용으로 일부러 보낸 요청을 제외한 오류 (NotionSender 가 제한을 넘긴 요청)
+        report["server"]["unexpected_errors"] = notion.stats["errors"].get("validation_error", 0) - len(report["limits"])
+
+    print("\n=== Notion 업로드 벤치마크 ===")
+    for r in report["layouts"]:
+        c = r["client"]
+        print(f"{r['layout']:<8} {r['pages']}페이지 {r['wall_s']:.1f}s ({r['pages_per_s']:.2f}/s, p50 {r['p50_s']}s, p95 {r['p95_s']}s)"
+              f" | 요청 {r['requests']}건, 429 {r['rate_limited']}건, 재시도 {c['retries']}회 ({c['wait_s']:.1f}s 대기)")
+        dedup_ok = r["dedup_check"] == {"before": False, "after": True}
+        print(f"         블록/페이지 {r['blocks_per_page']}, 실패 {r['failures']}건, "
+              f"중복 확인 {'✅' if dedup_ok else '❌'} (전송 전 {r['dedup_check']['before']}, 후 {r['dedup_check']['after']})")
+    for name, ok in report["limits"]:
+        print(f"{'✅' if ok else '❌'} {name}")
+    unexpected = report["server"]["unexpected_errors"]
+    print(f"{'✅' if not unexpected else '❌'} 전송 중 검증 오류 {unexpected}건")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    consistent = all(
+        not r["failures"] and len(r["blocks_per_page"]) == 1 and r["dedup_check"] == {"before": False, "after": True}
+        for r in report["layouts"]
+    )
+    return 0 if consistent and not unexpected and all(ok for _, ok in report["limits"]) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""고지서 게시일 예측 및 저비용 확인(probe) 기반 수집 스케줄러."""
+
+import json
+import os
+import re
+import statistics
+from datetime import date
+
+from apti_site import USER_AGENT
+from checkpoint import STATE_DIR, write_json_atomic
+
+DEFAULT_PUBLICATION_DAY = 20
+# 예측일보다 며칠 먼저부터 확인할지
+PROBE_LEAD_DAYS = 1
+
+_MONTH_RE = re.compile(r"(\d+)월분")
+
+
+def parse_costpay_month(html: str) -> str | None:
+    """관리비 페이지 HTML 의 costpayBox 에서 청구월 추출."""
+    start = html.find("costpayBox")
+    if start < 0:
+        return None
+    match = _MONTH_RE.search(html, start)
+    return match.group(1) if match else None
+
+
+def probe_month_http(base_url: str, storage_state: dict, timeout: float = 10.0) -> str | None:
+    """저장된 세션 쿠키로 관리비 페이지만 요청해 청구월 확인 (브라우저 미사용).
+
+    세션이 만료되었거나 페이지 구조가 다르면 None.
+    """
+    import httpx
+
+    cookies = httpx.Cookies()
+    for c in storage_state.get("cookies", []):
+        cookies.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+    try:
+        response = httpx.get(
+            f"{base_url}/apti/manage/manage_cost.asp?cate_code=AAEB",
+            cookies=cookies,
+            headers={"User-Agent": USER_AGENT},
+            timeout=timeout,
+            follow_redirects=False,
+        )
+    except httpx.HTTPError as e:
+        print(f"HTTP probe 실패: {e}")
+        return None
+    if response.status_code != 200:
+        return None
+    return parse_costpay_month(response.text)
+
+
+class BillScheduler:
+    """단지별 고지서 게시일 이력과 계정별 수집 완료 월을 관리."""
+
+    def __init__(self, path: str | None = None) -> None:
+        """초기화."""
+        self.path = path or os.path.join(STATE_DIR, "bill_schedule.json")
+        self.state = {"publications": {}, "collected": {}, "probes": {}}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.state.update(json.load(f))
+
+    def save(self) -> None:
+        """상태 저장 (임시 파일 후 교체)."""
+        write_json_atomic(self.path, self.state)
+
+    def predict_day(self, complex_key: str) -> int:
+        """과거 게시일(일자)의 중앙값으로 이번 달 게시일 예측."""
+        days = [date.fromisoformat(d).day for d in self.state["publications"].get(complex_key, {}).values()]
+        return round(statistics.median(days)) if days else DEFAULT_PUBLICATION_DAY
+
+    def is_collected(self, account: str, period: str) -> bool:
+        """계정의 해당 청구월(YYYY.MM) 수집 완료 여부."""
+        return period in self.state["collected"].get(account, [])
+
+    def should_probe(self, complex_key: str, today: date) -> bool:
+        """오늘 확인이 필요한지 (예측일 - PROBE_LEAD_DAYS 이후)."""
+        return today.day >= self.predict_day(complex_key) - PROBE_LEAD_DAYS
+
+    def record_probe(self, account: str, today: date, month: str | None) -> None:
+        """probe 결과 기록 (통계용)."""
+        probes = self.state["probes"].setdefault(account, [])
+        probes.append({"date": today.isoformat(), "month": month})
+        del probes[:-31]
+        self.save()
+
+    def record_publication(self, complex_key: str, period: str, today: date) -> None:
+        """청구월이 처음 확인된 날짜 기록 (이미 있으면 유지)."""
+        self.state["publications"].setdefault(complex_key, {}).setdefault(period, today.isoformat())
+        self.save()
+
+    def mark_collected(self, account: str, period: str) -> None:
+        """수집 완료 기록."""
+        collected = self.state["collected"].setdefault(account, [])
+        if period not in collected:
+            collected.append(period)
+        self.save()
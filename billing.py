@@ -0,0 +1,44 @@
+"""청구 데이터 공통 계산 (청구 연도/월 추정, 금액 변환)."""
+
+from datetime import datetime
+from typing import Any
+
+
+def parse_amount(value: Any) -> int:
+    """금액("1,234원" 등)/숫자 → 정수 (실패 시 0)."""
+    try:
+        if isinstance(value, str):
+            return int(value.replace(",", "").replace("원", "").strip())
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def billing_period(data: dict) -> tuple[int, int]:
+    """수집 데이터에서 (청구 연도, 청구월) 추정."""
+    month_str = data.get("maint_payment", {}).get("month", str(datetime.now().month))
+    timestamp = data.get("timestamp", datetime.now().isoformat())
+    try:
+        date_obj = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        date_obj = datetime.now()
+
+    year = date_obj.year
+    if data.get("payment_history"):
+        try:
+            last_bill = data["payment_history"][0].get("billing_month", "")  # 2025.11
+            if last_bill:
+                year = int(last_bill.split(".")[0])
+        except ValueError:
+            pass
+
+    month = int(month_str) if month_str.isdigit() else datetime.now().month
+    return year, month
+
+
+def previous_month(today: datetime | None = None) -> tuple[int, int]:
+    """지난달 (연도, 월) - 이번 달에 고지되는 청구월."""
+    today = today or datetime.now()
+    if today.month == 1:
+        return today.year - 1, 12
+    return today.year, today.month - 1
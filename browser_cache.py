@@ -0,0 +1,73 @@
+"""영구 브라우저 프로필 디렉터리 관리 (HTTP/스크립트 캐시 용량 제한 및 정리).
+
+프로필에는 캐시만 남기고 쿠키는 계정별 세션(storage_state)으로 매번 교체한다.
+"""
+
+import os
+import time
+
+from checkpoint import STATE_DIR
+
+PROFILE_ROOT = os.path.join(STATE_DIR, "browser_profiles")
+# 용량 정리 대상 (쿠키/설정 파일은 건드리지 않음)
+CACHE_DIRS = (
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "GPUCache"),
+    "ShaderCache",
+    "GrShaderCache",
+)
+PRUNE_STAMP = ".apti_pruned"
+
+
+def user_data_dir(name: str) -> str:
+    """워커/슬롯별 프로필 경로 (같은 디렉터리를 두 브라우저가 동시에 쓰지 않도록 이름을 나눔)."""
+    path = os.path.join(PROFILE_ROOT, name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _cache_files(path: str) -> list[tuple[float, int, str]]:
+    """캐시 파일 목록 (마지막 접근 시각, 크기, 경로)."""
+    files = []
+    for cache_dir in CACHE_DIRS:
+        for root, _, names in os.walk(os.path.join(path, cache_dir)):
+            for name in names:
+                file_path = os.path.join(root, name)
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    continue
+                files.append((max(st.st_atime, st.st_mtime), st.st_size, file_path))
+    return files
+
+
+def prune_profile(path: str, max_mb: int, max_age_days: int = 14, interval_hours: int = 24) -> dict | None:
+    """캐시 정리 (용량 초과 시 오래된 파일부터 상한의 80%까지, interval 마다 max_age 지난 파일 삭제).
+
+    정리하지 않았으면 None, 정리했으면 삭제 건수/용량 반환.
+    """
+    stamp = os.path.join(path, PRUNE_STAMP)
+    now = time.time()
+    periodic = not os.path.exists(stamp) or now - os.path.getmtime(stamp) > interval_hours * 3600
+    files = _cache_files(path)
+    total = sum(size for _, size, _ in files)
+    limit = max_mb * 1024 * 1024
+    if total <= limit and not periodic:
+        return None
+
+    removed, freed = 0, 0
+    target = limit * 0.8 if total > limit else total
+    for accessed, size, file_path in sorted(files):
+        expired = periodic and now - accessed > max_age_days * 86400
+        if total - freed <= target and not expired:
+            continue
+        try:
+            os.remove(file_path)
+        except OSError:
+            continue
+        removed += 1
+        freed += size
+    with open(stamp, "w", encoding="utf-8") as f:
+        f.write(str(now))
+    return {"removed": removed, "freed_mb": round(freed / (1024 * 1024), 1), "size_mb": round((total - freed) / (1024 * 1024), 1)}
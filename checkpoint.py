@@ -0,0 +1,118 @@
+"""섹션별 수집 체크포인트 (실패 섹션만 재수집하기 위한 로컬 상태 파일)."""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+STATE_DIR = ".apti_state"
+# 이보다 오래된 체크포인트의 섹션 데이터는 resume 에 쓰지 않음
+MAX_RESUME_AGE_SECONDS = 6 * 60 * 60
+
+
+def write_json_atomic(path: str, data, indent: int | None = 2) -> None:
+    """JSON 상태 파일 저장 (임시 파일에 쓴 뒤 교체 - 중간에 죽어도 이전 파일이 남음)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def account_key(user_id: str) -> str:
+    """계정 식별용 해시 (파일명에 아이디/전화번호를 그대로 쓰지 않음)."""
+    return hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:12]
+
+
+def default_checkpoint_path(user_id: str) -> str:
+    """계정별 기본 체크포인트 경로."""
+    return os.path.join(STATE_DIR, f"checkpoint_{account_key(user_id)}.json")
+
+
+class Checkpoint:
+    """섹션 단위 진행 상태와 세션(storage_state)을 파일에 저장."""
+
+    def __init__(self, path: str) -> None:
+        """초기화 (파일이 있으면 로드)."""
+        self.path = path
+        self.state = {"started_at": datetime.now().isoformat(), "storage_state": None, "sections": {}}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"체크포인트 로드 실패, 새로 시작: {e}")
+
+    def reset(self) -> None:
+        """새 실행을 위해 상태 초기화."""
+        self.state = {"started_at": datetime.now().isoformat(), "storage_state": None, "sections": {}}
+        self.save()
+
+    def reset_sections(self) -> None:
+        """섹션 진행 상태만 초기화 (세션은 유지)."""
+        self.state.update({"started_at": datetime.now().isoformat(), "sections": {}, "completed_at": None})
+        self.save()
+
+    def resumable(self) -> bool:
+        """resume 에 쓸 수 있는 체크포인트인지 (완료되지 않았고 오래되지 않음)."""
+        if self.state.get("completed_at"):
+            return False
+        try:
+            started = datetime.fromisoformat(self.state.get("started_at", ""))
+        except (TypeError, ValueError):
+            return False
+        return (datetime.now() - started).total_seconds() <= MAX_RESUME_AGE_SECONDS
+
+    def mark_complete(self) -> None:
+        """모든 섹션 성공 - 섹션 데이터를 비우고 완료 표시 (세션은 유지)."""
+        self.state["sections"] = {}
+        self.state["completed_at"] = datetime.now().isoformat()
+        self.save()
+
+    def save(self) -> None:
+        """상태 저장 (임시 파일 후 교체)."""
+        write_json_atomic(self.path, self.state)
+
+    @property
+    def storage_state(self) -> dict | None:
+        """저장된 브라우저 세션."""
+        return self.state.get("storage_state")
+
+    @storage_state.setter
+    def storage_state(self, value: dict | None) -> None:
+        self.state["storage_state"] = value
+        self.save()
+
+    def is_done(self, section: str) -> bool:
+        """섹션 완료 여부."""
+        return self.state["sections"].get(section, {}).get("status") == "done"
+
+    def section_data(self, section: str) -> dict:
+        """완료된 섹션 데이터."""
+        return self.state["sections"].get(section, {}).get("data", {})
+
+    def failed_sections(self) -> list[str]:
+        """실패한 섹션 목록."""
+        return [name for name, s in self.state["sections"].items() if s.get("status") == "failed"]
+
+    def mark_done(self, section: str, data: dict, attempts: int) -> None:
+        """섹션 완료 기록."""
+        self.state["sections"][section] = {
+            "status": "done",
+            "data": data,
+            "attempts": attempts,
+            "updated_at": datetime.now().isoformat(),
+        }
+        self.save()
+
+    def mark_failed(self, section: str, error: str, attempts: int) -> None:
+        """섹션 실패 기록."""
+        self.state["sections"][section] = {
+            "status": "failed",
+            "error": error,
+            "attempts": attempts,
+            "updated_at": datetime.now().isoformat(),
+        }
+        self.save()
@@ -0,0 +1,476 @@
+"""APT.i 통합 CLI (scrape / send / check / backfill).
+
+무거운 모듈(playwright, notion_client)은 해당 서브커맨드에서만 import 한다.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from apti_site import default_complex_key
+from billing import billing_period, previous_month
+
+_STARTED = time.perf_counter()
+_IMPORT_TIMES: list[tuple[str, float]] = []
+
+
+def lazy_import(name: str):
+    """모듈을 필요할 때 import 하고 소요 시간을 기록."""
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    _IMPORT_TIMES.append((name, time.perf_counter() - started))
+    return module
+
+
+def print_startup_report() -> None:
+    """import 시간 리포트 출력."""
+    print("\n=== 시작 시간 리포트 ===")
+    for name, elapsed in _IMPORT_TIMES:
+        print(f"   - import {name}: {elapsed * 1000:.1f}ms")
+    print(f"   - 전체 경과: {(time.perf_counter() - _STARTED) * 1000:.1f}ms")
+
+
+def require_env(*names: str) -> list[str]:
+    """필수 환경 변수 확인 후 값 반환 (누락 시 종료)."""
+    values = [os.environ.get(name) for name in names]
+    if not all(values):
+        print("필수 환경 변수가 누락되었습니다.")
+        print(f"필요한 환경 변수: {', '.join(names)}")
+        sys.exit(1)
+    return values
+
+
+def print_deadline_report(deadline) -> None:
+    """단계별 시간 예산 사용 내역 출력."""
+    summary = deadline.summary()
+    print(f"\n=== 시간 예산 {summary['elapsed_s']:.1f}s / {summary['total_s']:.0f}s ===")
+    for s in summary["steps"]:
+        print(f"   - {s['step']:<8} {s['elapsed_s']:>6.1f}s / {s['budget_s']:>6.1f}s  {s['status']}")
+
+
+def load_result(path: str) -> dict:
+    """저장된 수집 결과 JSON 로드."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def summarize(data: dict) -> None:
+    """수집 결과 요약 출력."""
+    amount = data.get("maint_payment", {}).get("amount", "N/A")
+    print(f"수집 완료: {data.get('dong_ho')} / 청구액 {amount}원")
+    print(f"   - 관리비 항목: {len(data.get('maint_items', []))}개")
+    print(f"   - 에너지 카테고리: {len(data.get('energy_category', []))}개")
+    print(f"   - 납부내역: {len(data.get('payment_history', []))}건")
+
+
+def sender_options(args: argparse.Namespace, timeout_ms: int | None = None) -> dict:
+    """NotionSender 옵션 (레이아웃, 블록 한도, 타임아웃, API 주소)."""
+    return {
+        "timeout_ms": timeout_ms,
+        "render_mode": args.layout,
+        "max_blocks": args.max_blocks,
+        "max_depth": args.max_depth,
+        "base_url": args.notion_base_url,
+    }
+
+
+def make_sender(args: argparse.Namespace, timeout_ms: int | None = None):
+    """환경 변수 기반 NotionSender 생성."""
+    notion_token, notion_db_id = require_env("NOTION_TOKEN", "NOTION_DATABASE_ID")
+    NotionSender = lazy_import("notion_sender").NotionSender
+    return NotionSender(notion_token, notion_db_id, **sender_options(args, timeout_ms))
+
+
+def scrape(args: argparse.Namespace, deadline=None) -> dict | None:
+    """APT.i 데이터 수집."""
+    user_id, password = require_env("APTI_USER_ID", "APTI_PASSWORD")
+    APTiParser = lazy_import("apti_parser").APTiParser
+    profiler = None
+    if args.profile:
+        profiler = lazy_import("scrape_profiler").ScrapeProfiler(args.profile_dir, tracing=not args.no_trace)
+    print("아파트아이 데이터 수집 시작...")
+    parser = APTiParser(
+        user_id,
+        password,
+        profile=args.browser_profile,
+        rss_budget_mb=args.rss_budget_mb,
+        resume=args.resume,
+        section_retries=args.section_retries,
+        profiler=profiler,
+        deadline=deadline,
+        full_refresh=args.full_refresh,
+        user_data_dir=lazy_import("browser_cache").user_data_dir("scrape") if args.persistent_profile else None,
+        cache_mb=args.cache_mb,
+    )
+    return asyncio.run(parser.run())
+
+
+def send(sender, data: dict, force: bool = False) -> bool:
+    """중복 확인 후 Notion 전송."""
+    year, month = billing_period(data)
+    if not force and sender.check_month_exists(year, month):
+        print(f"⚠️  {year}년 {month}월 데이터가 이미 존재합니다. 전송을 건너뜁니다.")
+        return True
+    print(f"Notion 대시보드 생성: {year}년 {month}월")
+    return sender.update_or_create_page(data)
+
+
+def sink_names(args: argparse.Namespace) -> list[str]:
+    """사용할 sink 목록 (--sinks, --send 는 notion 추가)."""
+    names = [n.strip() for n in args.sinks.split(",") if n.strip()]
+    if args.send and "notion" not in names:
+        names.append("notion")
+    return names
+
+
+def build_sinks(names: list[str], args: argparse.Namespace, timeout_ms: int | None = None) -> list:
+    """sink 객체 생성 (notion 은 환경 변수 필요)."""
+    sinks_module = lazy_import("sinks")
+    sinks = []
+    for name in names:
+        if name == "json":
+            sinks.append(sinks_module.JsonFileSink(args.output))
+        elif name == "notion":
+            notion_token, notion_db_id = require_env("NOTION_TOKEN", "NOTION_DATABASE_ID")
+            sinks.append(sinks_module.NotionSink(
+                notion_token, notion_db_id, args.force, **sender_options(args, timeout_ms)
+            ))
+        elif name in sinks_module.SINK_TYPES:
+            sinks.append(sinks_module.SINK_TYPES[name]())
+        else:
+            raise SystemExit(f"알 수 없는 sink: {name} (사용 가능: {', '.join(sinks_module.SINK_TYPES)})")
+    return sinks
+
+
+def write_sinks(names: list[str], data: dict, args: argparse.Namespace, timeout_ms: int | None = None) -> bool:
+    """sink 동시 실행 후 결과 출력 (모두 성공 시 True)."""
+    sinks_module = lazy_import("sinks")
+    results = asyncio.run(sinks_module.run_sinks(build_sinks(names, args, timeout_ms), data))
+    sinks_module.print_sink_results(results)
+    return all(r["ok"] for r in results)
+
+
+def cmd_scrape(args: argparse.Namespace) -> int:
+    """scrape: 수집 후 설정된 sink 로 출력 (기본 json, --send 시 notion 추가)."""
+    names = sink_names(args)
+    deadline = None
+    if args.deadline:
+        deadline_module = lazy_import("deadline")
+        weights = dict(deadline_module.DEFAULT_WEIGHTS)
+        if "notion" not in names:
+            weights.pop("notion")
+        deadline = deadline_module.Deadline(args.deadline, weights)
+    try:
+        data = scrape(args, deadline)
+        if not data:
+            print("데이터 수집 실패")
+            return 1
+        summarize(data)
+        if data.get("failed_sections"):
+            # 불완전한 결과는 JSON 파일로만 남김 (이력 DB/CSV/집계/Notion 의 정상 값을 덮어쓰지 않도록)
+            write_sinks(["json"], data, args)
+            print(f"일부 섹션 수집 실패: {', '.join(data['failed_sections'])} → 'scrape --resume' 으로 재시도")
+            return 2
+        if not deadline or "notion" not in names:
+            return 0 if write_sinks(names, data, args) else 1
+        # Notion 요청은 취소할 수 없으므로 단계 예산을 요청별 타임아웃으로 사용
+        with deadline.sync_step("notion") as budget:
+            return 0 if write_sinks(names, data, args, timeout_ms=int(budget * 1000)) else 1
+    finally:
+        if deadline:
+            print_deadline_report(deadline)
+
+
+def cmd_poll(args: argparse.Namespace) -> int:
+    """poll: 예측 게시일 전후로 청구월만 확인하고, 새 청구월이 보이면 전체 수집."""
+    user_id, password = require_env("APTI_USER_ID", "APTI_PASSWORD")
+    BillScheduler = lazy_import("bill_scheduler").BillScheduler
+    account = lazy_import("checkpoint").account_key(user_id)
+    today = datetime.now().date()
+    year, month = previous_month()
+    period = f"{year}.{month:02d}"
+
+    scheduler = BillScheduler()
+    if scheduler.is_collected(account, period):
+        print(f"{period} 청구분은 이미 수집되었습니다.")
+        return 0
+
+    complex_key = args.complex or default_complex_key()
+    if not scheduler.should_probe(complex_key, today):
+        print(f"예상 게시일({scheduler.predict_day(complex_key)}일) 이전이므로 확인을 건너뜁니다.")
+        return 0
+
+    APTiParser = lazy_import("apti_parser").APTiParser
+
+    # resume=True: 체크포인트의 세션을 유지한 채 청구월만 확인
+    prober = APTiParser(user_id, password, resume=True)
+    probed = asyncio.run(prober.probe_month())
+    scheduler.record_probe(account, today, probed)
+    if not probed or int(probed) != month:
+        print(f"{period} 청구분 아직 미게시 (현재 표시: {probed or '-'}월분)")
+        return 0
+
+    print(f"{period} 청구분 게시 확인 → 전체 수집 시작")
+    scheduler.record_publication(complex_key, period, today)
+    # probe 가 저장한 세션으로 바로 수집 (이전 실행의 섹션 데이터는 이전 청구월일 수 있으므로 비움)
+    prober.checkpoint.reset_sections()
+    args.resume = True
+    result = cmd_scrape(args)
+    if result == 0:
+        scheduler.mark_collected(account, period)
+    return result
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    """batch: manifest 의 계정들을 여러 워커 프로세스로 분산 수집."""
+    shard_runner = lazy_import("shard_runner")
+    accounts = shard_runner.load_manifest(args.manifest)
+    report = shard_runner.run_sharded(
+        accounts,
+        workers=args.workers,
+        per_worker=args.per_worker,
+        profile=args.browser_profile,
+        rss_budget_mb=args.rss_budget_mb,
+        section_retries=args.section_retries,
+        adaptive=args.adaptive,
+        max_per_worker=args.max_per_worker,
+        latency_target_ms=args.latency_target_ms,
+        full_refresh=args.full_refresh,
+        persistent=args.persistent_profile,
+        cache_mb=args.cache_mb,
+        deadline=args.deadline,
+    )
+    shard_runner.print_shard_summary(report)
+
+    output = args.output or f"batch_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"집계 결과 저장: {output}")
+
+    # 계정별 결과는 집계 파일에 있으므로 json 외 sink 만 적용
+    names = [n for n in sink_names(args) if n != "json"]
+    sinks_ok = True
+    if names:
+        for r in report["results"]:
+            if r["ok"]:
+                print(f"\n[{r['name']}]")
+                sinks_ok = write_sinks(names, r["data"], args) and sinks_ok
+    return 0 if sinks_ok and report["summary"]["ok"] == report["summary"]["accounts"] else 1
+
+
+def cmd_rollup(args: argparse.Namespace) -> int:
+    """rollup: 단지/동 월 집계 출력 (--publish 시 Notion 요약 페이지 생성)."""
+    store = lazy_import("rollups").RollupStore()
+    targets = [
+        (complex_key, period)
+        for complex_key, period in store.periods()
+        if (not args.complex or complex_key == args.complex) and (not args.period or period == args.period)
+    ]
+    if not targets:
+        print("집계 데이터가 없습니다.")
+        return 1
+
+    sender = None
+    if args.publish:
+        notion_token, notion_db_id = require_env("NOTION_TOKEN", "NOTION_DATABASE_ID")
+        NotionSender = lazy_import("notion_sender").NotionSender
+        database_id = os.environ.get("NOTION_ROLLUP_DATABASE_ID") or notion_db_id
+        sender = NotionSender(notion_token, database_id, **sender_options(args))
+    failed = 0
+    for complex_key, period in targets:
+        summary = store.summary(complex_key, period)
+        amount = summary["stats"].get("amount", {})
+        print(f"{complex_key} {period}: 세대 {amount.get('n', 0)}곳, "
+              f"평균 {amount.get('mean', 0):,.0f}원, 중앙값 {amount.get('median', 0):,.0f}원, 동 {len(summary['dongs'])}개")
+        if sender:
+            key = store.key(complex_key, period)
+            page_id = sender.create_rollup_page(summary, store.state["published"].get(key))
+            if page_id:
+                store.state["published"][key] = page_id
+                store.save()
+            else:
+                failed += 1
+    return 1 if failed else 0
+
+
+def cmd_send(args: argparse.Namespace) -> int:
+    """send: 저장된 JSON 파일을 Notion으로 전송 (playwright 미사용)."""
+    data = load_result(args.file)
+    return 0 if send(make_sender(args), data, args.force) else 1
+
+
+def cmd_check(args: argparse.Namespace) -> int:
+    """check: 해당 월 페이지 존재 여부 확인 (존재 시 종료 코드 3)."""
+    if args.file:
+        year, month = billing_period(load_result(args.file))
+    else:
+        default_year, default_month = previous_month()
+        year = args.year or default_year
+        month = args.month or default_month
+    if make_sender(args).check_month_exists(year, month):
+        print(f"{year}년 {month}월 데이터가 이미 존재합니다.")
+        return 3
+    print(f"{year}년 {month}월 데이터 없음")
+    return 0
+
+
+def cmd_backfill(args: argparse.Namespace) -> int:
+    """backfill: 여러 JSON 파일을 청구월 순서대로 전송 (기존 월은 건너뜀)."""
+    results = sorted((load_result(path) for path in args.files), key=billing_period)
+    sender = make_sender(args)
+    failed = 0
+    for data in results:
+        if not send(sender, data, args.force):
+            failed += 1
+    print(f"backfill 완료: {len(results) - failed}/{len(results)}건 성공")
+    return 1 if failed else 0
+
+
+def positive_int(value: str) -> int:
+    """argparse 용 1 이상 정수."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"정수가 아닙니다: {value}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1 이상이어야 합니다: {value}")
+    return number
+
+
+def add_scrape_arguments(p: argparse.ArgumentParser) -> None:
+    """scrape/poll 공통 인자."""
+    p.add_argument("-o", "--output", help="결과 JSON 경로 (기본: apti_result_<시각>.json)")
+    p.add_argument("--send", action="store_true", help="수집 후 Notion 전송 (--sinks 에 notion 추가)")
+    p.add_argument("--force", action="store_true", help="중복 확인 없이 전송")
+    p.add_argument(
+        "--sinks",
+        default=os.environ.get("APTI_SINKS", "json"),
+        help="출력 대상 (쉼표 구분: json,history,csv,notion,rollup)",
+    )
+    p.add_argument(
+        "--browser-profile",
+        choices=["default", "lowmem"],
+        default=os.environ.get("APTI_BROWSER_PROFILE", "default"),
+        help="브라우저 실행 프로필 (lowmem: 저메모리 플래그/작은 뷰포트)",
+    )
+    p.add_argument("--rss-budget-mb", type=int, help="브라우저 RSS 상한 (초과 시 재시작)")
+    p.add_argument("--resume", action="store_true", help="이전 실행에서 실패한 섹션만 재수집 (세션 재사용)")
+    p.add_argument("--section-retries", type=int, default=2, help="섹션별 재시도 횟수")
+    p.add_argument("--full-refresh", action="store_true", help="납부 원장을 무시하고 납부 내역 전체 재수집")
+    p.add_argument(
+        "--persistent-profile",
+        action="store_true",
+        default=os.environ.get("APTI_PERSISTENT_PROFILE") == "1",
+        help="영구 브라우저 프로필로 HTTP/스크립트 캐시를 실행 간 재사용 (.apti_state/browser_profiles)",
+    )
+    p.add_argument("--cache-mb", type=int, default=64, help="영구 프로필 캐시 상한 (초과 시 오래된 캐시부터 정리)")
+    p.add_argument("--profile", action="store_true", help="네트워크 워터폴/성능 지표 기록 및 요약 출력")
+    p.add_argument("--profile-dir", default="profiles", help="프로파일 결과 저장 경로")
+    p.add_argument("--no-trace", action="store_true", help="프로파일 시 Playwright tracing 생략")
+    p.add_argument(
+        "--deadline",
+        type=float,
+        default=float(os.environ.get("APTI_DEADLINE_SECONDS", 0)) or None,
+        help="계정 1건 전체 시간 예산(초) - 단계별로 배분, 초과 단계는 취소",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """인자 파서 구성."""
+    parser = argparse.ArgumentParser(description="APT.i 관리비 수집 및 Notion 전송")
+    parser.add_argument("--profile-startup", action="store_true", help="모듈 import 시간 리포트 출력")
+    parser.add_argument(
+        "--layout",
+        choices=["rich", "compact"],
+        default=os.environ.get("APTI_NOTION_LAYOUT", "rich"),
+        help="Notion 페이지 레이아웃 (compact: 표 중심, 블록 수 최소화)",
+    )
+    parser.add_argument("--max-blocks", type=positive_int, help="Notion 본문 최대 블록 수 (1 이상, compact 기본 100)")
+    parser.add_argument("--max-depth", type=positive_int, help="Notion 블록 최대 중첩 깊이 (1 이상, compact 기본 2)")
+    parser.add_argument(
+        "--notion-base-url",
+        default=os.environ.get("NOTION_BASE_URL"),
+        help="Notion API 주소 (로컬 대역 서버: python mock_notion.py)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("scrape", help="APT.i 데이터 수집 후 JSON 저장")
+    add_scrape_arguments(p)
+    p.set_defaults(func=cmd_scrape)
+
+    p = sub.add_parser("poll", help="고지서 게시 여부를 저비용으로 확인 후 새 청구월이면 수집")
+    add_scrape_arguments(p)
+    p.add_argument("--complex", help="단지 식별자 (기본: APTI_COMPLEX, 없으면 APT.i 단지 호스트명)")
+    p.set_defaults(func=cmd_poll)
+
+    p = sub.add_parser("batch", help="manifest 계정 목록을 여러 프로세스로 분산 수집")
+    p.add_argument("manifest", help='계정 목록 JSON ([{"name", "user_id", "password" | "password_env"}])')
+    p.add_argument("-o", "--output", help="집계 결과 JSON 경로 (기본: batch_result_<시각>.json)")
+    p.add_argument("--workers", type=int, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    p.add_argument("--per-worker", type=int, default=1, help="워커당 동시 수집 계정 수 (--adaptive 면 시작값)")
+    p.add_argument("--adaptive", action="store_true", help="사이트 응답 지연/오류/로그인 실패에 따라 워커당 동시 수 자동 조절 (AIMD)")
+    p.add_argument("--max-per-worker", type=int, default=4, help="--adaptive 워커당 동시 수 상한")
+    p.add_argument("--latency-target-ms", type=float, help="--adaptive 문서 응답 지연 상한 (기본: 관측 최저값의 2배)")
+    p.add_argument(
+        "--browser-profile",
+        choices=["default", "lowmem"],
+        default="lowmem",
+        help="브라우저 실행 프로필 (워커당 동시 수집이 2 이상이면 lowmem 의 renderer 수 제한은 적용하지 않음)",
+    )
+    p.add_argument("--rss-budget-mb", type=int, help="워커 브라우저 RSS 상한 (초과 시 재시작)")
+    p.add_argument("--section-retries", type=int, default=2)
+    p.add_argument("--full-refresh", action="store_true", help="계정별 납부 내역 전체 재수집")
+    p.add_argument("--persistent-profile", action="store_true", help="슬롯별 영구 브라우저 프로필로 캐시 재사용")
+    p.add_argument("--cache-mb", type=int, default=64, help="프로필당 캐시 상한")
+    p.add_argument(
+        "--deadline",
+        type=float,
+        default=float(os.environ.get("APTI_DEADLINE_SECONDS", 0)) or None,
+        help="계정 1건당 수집 시간 예산(초) - 계정마다 단계별로 배분, 초과 단계는 취소",
+    )
+    p.add_argument("--sinks", default="", help="계정별 추가 출력 대상 (history,csv,notion,rollup)")
+    p.add_argument("--send", action="store_true", help="계정별 Notion 전송")
+    p.add_argument("--force", action="store_true", help="중복 확인 없이 전송")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("rollup", help="단지/동 월 집계 확인 및 Notion 요약 페이지 게시")
+    p.add_argument("--complex", help="단지 (기본: 전체)")
+    p.add_argument("--period", help="청구월 YYYY.MM (기본: 전체)")
+    p.add_argument("--publish", action="store_true", help="단지·월별 요약 페이지를 Notion 에 게시 (이전 페이지는 보관)")
+    p.set_defaults(func=cmd_rollup)
+
+    p = sub.add_parser("send", help="저장된 JSON 파일을 Notion으로 전송")
+    p.add_argument("file")
+    p.add_argument("--force", action="store_true", help="중복 확인 없이 전송")
+    p.set_defaults(func=cmd_send)
+
+    p = sub.add_parser("check", help="해당 월 데이터 존재 여부 확인")
+    p.add_argument("--year", type=int)
+    p.add_argument("--month", type=int)
+    p.add_argument("--file", help="JSON 파일에서 청구월 추정")
+    p.set_defaults(func=cmd_check)
+
+    p = sub.add_parser("backfill", help="여러 JSON 파일을 순서대로 전송")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--force", action="store_true", help="중복 확인 없이 전송")
+    p.set_defaults(func=cmd_backfill)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI 진입점."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    finally:
+        if args.profile_startup:
+            print_startup_report()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
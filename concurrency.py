@@ -0,0 +1,113 @@
+"""APT.i 사이트 부하에 맞춘 동시 수집 수 조절 (AIMD).
+
+사이트가 건강하면 동시 수를 1씩 늘리고, 응답 지연이 커지거나 오류/로그인 실패(token 쿠키 없음)가
+나오면 절반으로 줄인다. 판단은 완료된 계정 window 건마다 한 번씩 한다.
+"""
+
+import asyncio
+import statistics
+import time
+
+
+class AimdController:
+    """동시 수집 수 제한기 (가산 증가 / 승산 감소)."""
+
+    def __init__(
+        self,
+        initial: int = 1,
+        max_limit: int = 8,
+        min_limit: int = 1,
+        window: int = 2,
+        latency_target_ms: float | None = None,
+        latency_factor: float = 2.0,
+        error_threshold: float = 0.2,
+        decrease: float = 0.5,
+    ) -> None:
+        """초기화.
+
+        window: 조절 판단에 쓰는 완료 계정 수
+        latency_target_ms: 응답 지연 상한 (미지정 시 관측된 최저 window 중앙값 × latency_factor)
+        error_threshold: window 내 오류 비율이 이 값을 넘으면 감소
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.window = max(1, window)
+        self.latency_target_ms = latency_target_ms
+        self.latency_factor = latency_factor
+        self.error_threshold = error_threshold
+        self.decrease = decrease
+        self.active = 0
+        self.baseline_ms: float | None = None
+        self.history: list[dict] = []
+        self._samples: list[dict] = []
+        self._started = time.perf_counter()
+        self._cond = asyncio.Condition()
+        self._log(self.limit, "start")
+
+    def _log(self, limit: int, reason: str, **extra) -> None:
+        """limit 변경 이력 기록."""
+        self.history.append({"t_s": round(time.perf_counter() - self._started, 2), "limit": limit, "reason": reason, **extra})
+
+    async def acquire(self) -> None:
+        """슬롯 획득 (현재 limit 까지만 동시 진행)."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def abandon(self) -> None:
+        """결과 없이 슬롯 반납 (처리할 작업이 없을 때)."""
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    async def release(self, latency_ms: float | None, ok: bool, login_ok: bool | None = None) -> None:
+        """슬롯 반납 및 결과 기록 (window 가 차면 limit 조절)."""
+        async with self._cond:
+            self.active -= 1
+            self._samples.append({"latency_ms": latency_ms, "ok": ok, "login_ok": login_ok})
+            if len(self._samples) >= self.window:
+                self._adjust()
+            self._cond.notify_all()
+
+    def _adjust(self) -> None:
+        """window 결과로 limit 증감."""
+        samples, self._samples = self._samples, []
+        latencies = [s["latency_ms"] for s in samples if s["latency_ms"] is not None]
+        latency = statistics.median(latencies) if latencies else None
+        error_rate = sum(1 for s in samples if not s["ok"]) / len(samples)
+        login_failures = sum(1 for s in samples if s["login_ok"] is False)
+
+        if latency is not None and error_rate == 0:
+            self.baseline_ms = latency if self.baseline_ms is None else min(self.baseline_ms, latency)
+        target = self.latency_target_ms or (self.baseline_ms * self.latency_factor if self.baseline_ms else None)
+
+        if login_failures:
+            reason = f"login_failed×{login_failures}"
+        elif error_rate > self.error_threshold:
+            reason = f"error_rate={error_rate:.0%}"
+        elif latency is not None and target is not None and latency > target:
+            reason = f"latency={latency:.0f}ms>{target:.0f}ms"
+        else:
+            reason = None
+
+        if reason:
+            new_limit = max(self.min_limit, int(self.limit * self.decrease))
+        else:
+            new_limit = min(self.max_limit, self.limit + 1)
+            reason = "healthy"
+        extra = {"latency_ms": round(latency, 1) if latency is not None else None, "error_rate": round(error_rate, 2)}
+        if new_limit != self.limit or reason != "healthy":
+            self._log(new_limit, reason, **extra)
+        self.limit = new_limit
+
+    def metrics(self) -> dict:
+        """현재 limit, 도달한 최대 limit, 감소 횟수, 변경 이력."""
+        limits = [h["limit"] for h in self.history]
+        return {
+            "limit": self.limit,
+            "max_limit_reached": max(limits),
+            "baseline_ms": round(self.baseline_ms, 1) if self.baseline_ms is not None else None,
+            "decreases": sum(1 for h in self.history if h["reason"] not in ("start", "healthy")),
+            "history": self.history,
+        }
@@ -0,0 +1,109 @@
+"""실행 전체 시간 예산(deadline)과 단계별 시간 배분."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+# 단계별 기본 가중치 (남은 시간을 아직 실행하지 않은 단계의 가중치 비율로 배분)
+DEFAULT_WEIGHTS = {
+    "launch": 1.0,
+    "login": 2.0,
+    "dong_ho": 1.0,
+    "maint": 3.0,
+    "energy": 1.5,
+    "history": 1.5,
+    "notion": 2.0,
+}
+
+
+class StepTimeout(Exception):
+    """단계 시간 예산 초과."""
+
+    def __init__(self, step: str, budget: float) -> None:
+        super().__init__(f"{step} 단계 시간 초과 (예산 {budget:.1f}초)")
+        self.step = step
+        self.budget = budget
+
+
+class Deadline:
+    """계정 1건 실행의 전체 예산을 단계별로 나누어 관리.
+
+    각 단계는 시작 시점의 남은 시간 × (단계 가중치 / 남은 단계 가중치 합) 만큼 받는다.
+    먼저 끝난 단계가 남긴 시간은 자연히 이후 단계로 이월된다.
+    """
+
+    def __init__(self, total_seconds: float, weights: dict[str, float] | None = None) -> None:
+        """초기화."""
+        self.total_seconds = total_seconds
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self._started = time.monotonic()
+        self._done: set[str] = set()
+        self.history: list[dict] = []
+
+    def remaining(self) -> float:
+        """전체 남은 시간 (초)."""
+        return max(0.0, self.total_seconds - (time.monotonic() - self._started))
+
+    def budget_for(self, step: str) -> float:
+        """단계에 배정할 시간 (초)."""
+        weight = self.weights.get(step, 1.0)
+        pending = sum(w for name, w in self.weights.items() if name not in self._done and name != step)
+        return self.remaining() * weight / (weight + pending)
+
+    def skip(self, step: str) -> None:
+        """실행하지 않는 단계 (예: 체크포인트 복원) - 배정 시간을 이후 단계로 넘김."""
+        self._done.add(step)
+        self.history.append({"step": step, "budget_s": 0.0, "elapsed_s": 0.0, "status": "not_run"})
+
+    def _finish(self, step: str, budget: float, started: float, status: str) -> None:
+        """단계 종료 기록."""
+        self._done.add(step)
+        self.history.append({
+            "step": step,
+            "budget_s": round(budget, 2),
+            "elapsed_s": round(time.monotonic() - started, 2),
+            "status": status,
+        })
+
+    @asynccontextmanager
+    async def step(self, name: str):
+        """비동기 단계 실행 (예산 초과 시 취소 후 StepTimeout)."""
+        budget = self.budget_for(name)
+        started = time.monotonic()
+        if budget <= 0:
+            self._finish(name, budget, started, "skipped")
+            raise StepTimeout(name, budget)
+        try:
+            async with asyncio.timeout(budget):
+                yield budget
+        except TimeoutError:
+            self._finish(name, budget, started, "timeout")
+            raise StepTimeout(name, budget) from None
+        except BaseException:
+            self._finish(name, budget, started, "error")
+            raise
+        self._finish(name, budget, started, "ok")
+
+    @contextmanager
+    def sync_step(self, name: str):
+        """동기 단계 실행 (취소 불가 - 호출 측에서 budget 을 요청 타임아웃으로 사용)."""
+        budget = self.budget_for(name)
+        started = time.monotonic()
+        if budget <= 0:
+            self._finish(name, budget, started, "skipped")
+            raise StepTimeout(name, budget)
+        try:
+            yield budget
+        except BaseException:
+            self._finish(name, budget, started, "error")
+            raise
+        elapsed = time.monotonic() - started
+        self._finish(name, budget, started, "ok" if elapsed <= budget else "overrun")
+
+    def summary(self) -> dict:
+        """실행 요약."""
+        return {
+            "total_s": self.total_seconds,
+            "elapsed_s": round(time.monotonic() - self._started, 2),
+            "steps": self.history,
+        }
@@ -3,10 +3,9 @@
 import asyncio
 import os
 import sys
-from datetime import datetime
 
-from apti_parser import APTiParser
-from notion_sender import NotionSender
+from billing import billing_period
+from cli import lazy_import
 
 
 async def main():
@@ -23,6 +22,10 @@ async def main():
         sys.exit(1)
 
     # 2. 데이터 수집
+    # 무거운 모듈은 환경 변수 확인 이후에 로드
+    APTiParser = lazy_import("apti_parser").APTiParser
+    NotionSender = lazy_import("notion_sender").NotionSender
+
     print("아파트아이 데이터 수집 시작...")
     parser = APTiParser(user_id, password)
     data = await parser.run()
@@ -34,7 +37,6 @@ async def main():
     # 수집 결과 요약
     maint_payment = data.get("maint_payment", {})
     amount = maint_payment.get("amount", "N/A")
-    month_str = maint_payment.get("month", str(datetime.now().month))
     
     print(f"수집 완료: {data.get('dong_ho')} / 청구액 {amount}원")
     print(f"   - 관리비 항목: {len(data.get('maint_items', []))}개")
@@ -45,23 +47,7 @@ async def main():
     print("\n중복 데이터 체크 중...")
     sender = NotionSender(notion_token, notion_db_id)
     
-    # 연도 추정
-    timestamp = data.get("timestamp", datetime.now().isoformat())
-    try:
-        date_obj = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-    except:
-        date_obj = datetime.now()
-    
-    current_year = date_obj.year
-    if data.get("payment_history"):
-        try:
-            last_bill = data["payment_history"][0].get("billing_month", "")  # 2025.11
-            if last_bill:
-                current_year = int(last_bill.split(".")[0])
-        except:
-            pass
-    
-    month_int = int(month_str) if month_str.isdigit() else datetime.now().month
+    current_year, month_int = billing_period(data)
     
     if sender.check_month_exists(current_year, month_int):
         print(f"⚠️  {current_year}년 {month_int}월 데이터가 이미 존재합니다. 중복 실행을 건너뜁니다.")
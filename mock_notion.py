@@ -0,0 +1,483 @@
+"""로컬 Notion API 대역 서버 (NotionSender 처리량/정합성 오프라인 테스트용).
+
+databases.retrieve / databases.query(페이지네이션) / pages.create / pages.update /
+blocks.children.append(+ list) 를 메모리에서 처리하고, 실제 API 의 요청당 블록 수·중첩 단계·
+텍스트 길이 제한과 429(Retry-After) 속도 제한을 흉내 낸다.
+
+    python mock_notion.py --port 8765 --rate 3
+    NOTION_BASE_URL=http://127.0.0.1:8765 NOTION_TOKEN=mock NOTION_DATABASE_ID=<출력된 ID> python cli.py send ...
+"""
+
+import argparse
+import json
+import math
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from notion_blocks import MAX_BLOCKS_PER_REQUEST, MAX_CHILDREN_PER_REQUEST
+
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT_ITEMS = 100
+# 요청당 중첩 단계 (최상위 블록 아래 2단계까지)
+MAX_NESTING = 2
+MAX_PAGE_SIZE = 100
+
+# 관리비 데이터베이스 기본 스키마 (NotionSender 가 쓰는 속성)
+DEFAULT_PROPERTIES = {
+    "Name": "title",
+    "청구월": "number",
+    "동호수": "rich_text",
+    "총 납부액": "number",
+    "🔥 난방/가스": "number",
+    "💧 수도요금": "number",
+    "⚡ 전기요금": "number",
+    "납부기한": "date",
+    "수집일시": "date",
+}
+
+
+class NotionError(Exception):
+    """Notion 형식 오류 응답."""
+
+    def __init__(self, status: int, code: str, message: str, headers: dict | None = None) -> None:
+        """초기화."""
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.headers = headers or {}
+
+
+def _now() -> str:
+    """Notion 형식 시각."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+def _validation(message: str) -> NotionError:
+    return NotionError(400, "validation_error", message)
+
+
+def _not_found(object_id: str) -> NotionError:
+    return NotionError(404, "object_not_found", f"Could not find object with ID: {object_id}.")
+
+
+def _check_text(value, path: str) -> None:
+    """rich_text 배열 길이/텍스트 길이 검사 (하위 구조 전체)."""
+    if isinstance(value, dict):
+        for key, child in value.items():
+            if key == "children":
+                continue
+            if key == "rich_text" and isinstance(child, list) and len(child) > MAX_RICH_TEXT_ITEMS:
+                raise _validation(f"{path}.rich_text.length should be ≤ `{MAX_RICH_TEXT_ITEMS}`, instead was `{len(child)}`.")
+            if key == "content" and isinstance(child, str) and len(child) > MAX_TEXT_LENGTH:
+                raise _validation(f"{path}.text.content.length should be ≤ `{MAX_TEXT_LENGTH}`, instead was `{len(child)}`.")
+            _check_text(child, f"{path}.{key}")
+    elif isinstance(value, list):
+        for i, child in enumerate(value):
+            _check_text(child, f"{path}[{i}]")
+
+
+def _plain_text(items: list[dict]) -> list[dict]:
+    """응답용 rich_text (plain_text 포함)."""
+    return [{**item, "plain_text": item.get("text", {}).get("content", "")} for item in items]
+
+
+class MockNotion:
+    """메모리 상태와 요청 처리 (HTTP 서버와 분리되어 있어 직접 호출도 가능)."""
+
+    ROUTES = [
+        ("GET", re.compile(r"^databases/([\w-]+)$"), "retrieve_database"),
+        ("POST", re.compile(r"^databases/([\w-]+)/query$"), "query_database"),
+        ("POST", re.compile(r"^pages$"), "create_page"),
+        ("GET", re.compile(r"^pages/([\w-]+)$"), "retrieve_page"),
+        ("PATCH", re.compile(r"^pages/([\w-]+)$"), "update_page"),
+        ("PATCH", re.compile(r"^blocks/([\w-]+)/children$"), "append_children"),
+        ("GET", re.compile(r"^blocks/([\w-]+)/children$"), "list_children"),
+    ]
+
+    def __init__(self, rate: float = 3.0, burst: int = 10, retry_after: int | None = None, latency_ms: float = 0) -> None:
+        """초기화.
+
+        rate/burst: 초당 평균 요청 수와 순간 허용량 (토큰 버킷, rate=0 이면 제한 없음)
+        retry_after: 429 응답의 Retry-After 초 (미지정 시 토큰이 찰 때까지 남은 시간, 올림)
+        latency_ms: 요청마다 추가할 처리 지연
+        """
+        self.rate = rate
+        self.burst = burst
+        self.retry_after = retry_after
+        self.latency_ms = latency_ms
+        self.lock = threading.Lock()
+        self.databases: dict[str, dict] = {}
+        self.pages: dict[str, dict] = {}
+        self.blocks: dict[str, dict] = {}
+        self.children: dict[str, list[str]] = {}
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": {}, "routes": {}, "blocks_created": 0}
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+
+    # --- 상태 준비 ---
+
+    def add_database(self, properties: dict[str, str] | None = None, database_id: str | None = None) -> str:
+        """데이터베이스 추가 (properties: 이름 → 타입). ID 반환."""
+        database_id = database_id or _new_id()
+        now = _now()
+        self.databases[database_id] = {
+            "object": "database",
+            "id": database_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "title": [{"type": "text", "text": {"content": "관리비"}, "plain_text": "관리비"}],
+            "properties": {
+                name: {"id": f"p{i}", "name": name, "type": prop_type, prop_type: {}}
+                for i, (name, prop_type) in enumerate((properties or DEFAULT_PROPERTIES).items())
+            },
+        }
+        return database_id
+
+    def seed_page(self, database_id: str, properties: dict) -> str:
+        """속도 제한 없이 페이지 추가 (벤치마크 사전 데이터용)."""
+        with self.lock:
+            return self.create_page({"parent": {"database_id": database_id}, "properties": properties})["id"]
+
+    # --- 요청 처리 ---
+
+    def _take_token(self) -> None:
+        """토큰 버킷에서 요청 1건 차감 (부족하면 429)."""
+        if not self.rate:
+            return
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens < 1:
+            wait = self.retry_after or max(1, math.ceil((1 - self._tokens) / self.rate))
+            raise NotionError(429, "rate_limited", "You have been rate limited. Please try again in a few minutes.",
+                              {"Retry-After": str(wait)})
+        self._tokens -= 1
+
+    def handle(self, method: str, path: str, body: dict | None, headers: dict) -> tuple[int, dict, dict]:
+        """요청 1건 처리 → (상태 코드, 응답 본문, 추가 헤더)."""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        path = path.split("?", 1)[0].strip("/")
+        path = path[3:] if path.startswith("v1/") else path
+        with self.lock:
+            self.stats["requests"] += 1
+            try:
+                if not headers.get("authorization", "").startswith("Bearer "):
+                    raise NotionError(401, "unauthorized", "API token is invalid.")
+                self._take_token()
+                for route_method, pattern, name in self.ROUTES:
+                    match = pattern.match(path)
+                    if match and route_method == method:
+                        self.stats["routes"][name] = self.stats["routes"].get(name, 0) + 1
+                        return 200, getattr(self, name)(*match.groups(), body or {}), {}
+                raise NotionError(400, "invalid_request_url", f"Invalid request URL: {method} /{path}")
+            except NotionError as e:
+                if e.status == 429:
+                    self.stats["rate_limited"] += 1
+                else:
+                    self.stats["errors"][e.code] = self.stats["errors"].get(e.code, 0) + 1
+                return e.status, {"object": "error", "status": e.status, "code": e.code, "message": e.message}, e.headers
+
+    # --- 엔드포인트 ---
+
+    def _database(self, database_id: str) -> dict:
+        database = self.databases.get(database_id) or next(
+            (d for d in self.databases.values() if d["id"].replace("-", "") == database_id.replace("-", "")), None
+        )
+        if not database:
+            raise _not_found(database_id)
+        return database
+
+    def retrieve_database(self, database_id: str, body: dict) -> dict:
+        return self._database(database_id)
+
+    def _matches(self, page: dict, flt: dict | None) -> bool:
+        """필터 평가 (and/or, number/select/status/rich_text/title 의 equals·contains)."""
+        if not flt:
+            return True
+        if "and" in flt:
+            return all(self._matches(page, f) for f in flt["and"])
+        if "or" in flt:
+            return any(self._matches(page, f) for f in flt["or"])
+        prop = page["properties"].get(flt.get("property"))
+        if prop is None:
+            raise _validation(f"Could not find property with name or id: {flt.get('property')}")
+        for prop_type in ("number", "select", "status", "rich_text", "title"):
+            if prop_type not in flt:
+                continue
+            if prop["type"] != prop_type:
+                raise _validation(f"database property {prop['type']} does not match filter {prop_type}")
+            condition = flt[prop_type]
+            if prop_type == "number":
+                value = prop["number"]
+            elif prop_type in ("select", "status"):
+                value = (prop[prop_type] or {}).get("name")
+            else:
+                value = "".join(t["plain_text"] for t in prop[prop_type])
+            if "equals" in condition:
+                return value == condition["equals"]
+            if "contains" in condition:
+                return condition["contains"] in (value or "")
+        raise _validation("Unsupported filter in mock server.")
+
+    def query_database(self, database_id: str, body: dict) -> dict:
+        database = self._database(database_id)
+        page_size = body.get("page_size", MAX_PAGE_SIZE)
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise _validation(f"body.page_size should be ≤ `{MAX_PAGE_SIZE}`, instead was `{page_size}`.")
+        matched = [
+            p for p in self.pages.values()
+            if p["parent"]["database_id"] == database["id"] and not p["archived"] and self._matches(p, body.get("filter"))
+        ]
+        start = 0
+        if body.get("start_cursor"):
+            ids = [p["id"] for p in matched]
+            if body["start_cursor"] not in ids:
+                raise _validation("start_cursor provided is invalid.")
+            start = ids.index(body["start_cursor"])
+        results = matched[start:start + page_size]
+        has_more = start + page_size < len(matched)
+        return {
+            "object": "list",
+            "results": results,
+            "has_more": has_more,
+            "next_cursor": matched[start + page_size]["id"] if has_more else None,
+            "type": "page_or_database",
+        }
+
+    def _properties(self, database: dict, properties: dict) -> dict:
+        """스키마 대조 후 응답 형식 속성으로 변환."""
+        schema = database["properties"]
+        shaped = {}
+        for name, value in properties.items():
+            if name not in schema:
+                raise _validation(f"{name} is not a property that exists.")
+            prop_type = schema[name]["type"]
+            if prop_type not in value:
+                raise _validation(f"{name} is expected to be {prop_type}.")
+            _check_text(value, f"body.properties.{name}")
+            content = value[prop_type]
+            if prop_type in ("title", "rich_text"):
+                content = _plain_text(content)
+            shaped[name] = {"id": schema[name]["id"], "type": prop_type, prop_type: content}
+        return shaped
+
+    def _check_children(self, children: list[dict]) -> None:
+        """요청 블록 제한 검사 (최상위/하위 개수, 전체 개수, 중첩 단계, 텍스트)."""
+        total = 0
+
+        def walk(blocks: list[dict], level: int, path: str) -> None:
+            nonlocal total
+            if len(blocks) > MAX_CHILDREN_PER_REQUEST:
+                raise _validation(f"{path}.length should be ≤ `{MAX_CHILDREN_PER_REQUEST}`, instead was `{len(blocks)}`.")
+            if blocks and level > MAX_NESTING:
+                raise _validation(f"{path} exceeds the maximum nesting depth of {MAX_NESTING} per request.")
+            for i, block in enumerate(blocks):
+                block_type = block.get("type") or next((k for k in block if k != "object"), None)
+                if not block_type or block_type not in block:
+                    raise _validation(f"{path}[{i}] should define a block type.")
+                total += 1
+                body = block[block_type]
+                _check_text(body, f"{path}[{i}].{block_type}")
+                if block_type == "table":
+                    width = body.get("table_width")
+                    for row in body.get("children", []):
+                        cells = row.get("table_row", {}).get("cells", [])
+                        if len(cells) != width:
+                            raise _validation(f"Number of cells in table row ({len(cells)}) does not match table width ({width}).")
+                walk(body.get("children", []) or [], level + 1, f"{path}[{i}].{block_type}.children")
+
+        walk(children, 0, "body.children")
+        if total > MAX_BLOCKS_PER_REQUEST:
+            raise _validation(f"body.children total blocks should be ≤ `{MAX_BLOCKS_PER_REQUEST}`, instead was `{total}`.")
+
+    def _store_children(self, parent_id: str, children: list[dict]) -> list[dict]:
+        """블록 저장 (하위 블록 포함). 생성된 최상위 블록 반환."""
+        created = []
+        for block in children:
+            block_type = block.get("type") or next(k for k in block if k != "object")
+            body = {k: v for k, v in block[block_type].items() if k != "children"}
+            block_id = _new_id()
+            now = _now()
+            stored = {
+                "object": "block",
+                "id": block_id,
+                "parent": {"type": "block_id", "block_id": parent_id},
+                "created_time": now,
+                "last_edited_time": now,
+                "has_children": bool(block[block_type].get("children")),
+                "archived": False,
+                "type": block_type,
+                block_type: body,
+            }
+            self.blocks[block_id] = stored
+            self.children.setdefault(parent_id, []).append(block_id)
+            self.stats["blocks_created"] += 1
+            self._store_children(block_id, block[block_type].get("children", []) or [])
+            created.append(stored)
+        return created
+
+    def create_page(self, body: dict) -> dict:
+        parent = body.get("parent", {})
+        if "database_id" not in parent:
+            raise _validation("body.parent.database_id should be defined.")
+        database = self._database(parent["database_id"])
+        properties = self._properties(database, body.get("properties", {}))
+        children = body.get("children", [])
+        self._check_children(children)
+        page_id = _new_id()
+        now = _now()
+        page = {
+            "object": "page",
+            "id": page_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+            "parent": {"type": "database_id", "database_id": database["id"]},
+            "properties": properties,
+            "url": f"https://www.notion.so/mock-{page_id.replace('-', '')}",
+        }
+        self.pages[page_id] = page
+        self._store_children(page_id, children)
+        return page
+
+    def _page(self, page_id: str) -> dict:
+        page = self.pages.get(page_id)
+        if not page:
+            raise _not_found(page_id)
+        return page
+
+    def retrieve_page(self, page_id: str, body: dict) -> dict:
+        return self._page(page_id)
+
+    def update_page(self, page_id: str, body: dict) -> dict:
+        page = self._page(page_id)
+        if page["archived"] and body.get("archived") is not False:
+            raise _validation("Can't edit block that is archived. You must unarchive the block before editing.")
+        if body.get("properties"):
+            page["properties"].update(self._properties(self._database(page["parent"]["database_id"]), body["properties"]))
+        if "archived" in body:
+            page["archived"] = bool(body["archived"])
+        page["last_edited_time"] = _now()
+        return page
+
+    def append_children(self, block_id: str, body: dict) -> dict:
+        if block_id not in self.pages and block_id not in self.blocks:
+            raise _not_found(block_id)
+        if (self.pages.get(block_id) or {}).get("archived"):
+            raise _validation("Can't edit block that is archived. You must unarchive the block before editing.")
+        children = body.get("children")
+        if not isinstance(children, list):
+            raise _validation("body.children should be an array.")
+        self._check_children(children)
+        created = self._store_children(block_id, children)
+        return {"object": "list", "results": created, "has_more": False, "next_cursor": None, "type": "block", "block": {}}
+
+    def list_children(self, block_id: str, body: dict) -> dict:
+        if block_id not in self.pages and block_id not in self.blocks:
+            raise _not_found(block_id)
+        results = [self.blocks[i] for i in self.children.get(block_id, [])]
+        return {"object": "list", "results": results, "has_more": False, "next_cursor": None, "type": "block", "block": {}}
+
+    def count_descendants(self, block_id: str) -> int:
+        """저장된 하위 블록 전체 수 (검증용)."""
+        return sum(1 + self.count_descendants(c) for c in self.children.get(block_id, []))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP → MockNotion.handle 연결."""
+
+    protocol_version = "HTTP/1.1"
+    notion: MockNotion
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        status, payload, extra = self.notion.handle(self.command, self.path, body, headers)
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in extra.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class MockNotionServer:
+    """백그라운드 스레드에서 실행하는 대역 서버 (with 문 사용 가능)."""
+
+    def __init__(self, notion: MockNotion | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        """초기화 (port=0 이면 빈 포트 자동 선택)."""
+        self.notion = notion or MockNotion()
+        handler = type("Handler", (_Handler,), {"notion": self.notion})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """NotionSender base_url 로 쓸 주소."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockNotionServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockNotionServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """단독 실행."""
+    parser = argparse.ArgumentParser(description="로컬 Notion API 대역 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=3.0, help="초당 평균 허용 요청 수 (0: 제한 없음)")
+    parser.add_argument("--burst", type=int, default=10, help="순간 허용 요청 수")
+    parser.add_argument("--retry-after", type=int, help="429 응답 Retry-After 초 (기본: 토큰 회복 시간)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="요청별 추가 지연")
+    parser.add_argument("--database-id", help="데이터베이스 ID (기본: 임의 생성)")
+    args = parser.parse_args()
+
+    notion = MockNotion(args.rate, args.burst, args.retry_after, args.latency_ms)
+    database_id = notion.add_database(database_id=args.database_id)
+    server = MockNotionServer(notion, port=args.port)
+    print(f"Mock Notion: {server.base_url}  (NOTION_DATABASE_ID={database_id})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(notion.stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
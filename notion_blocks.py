@@ -0,0 +1,90 @@
+"""Notion 블록 유틸리티 (블록 수/중첩 깊이 제한, append 배치 분할)."""
+
+# Notion API 제한: 요청당 children 100개, 요청당 전체 블록 1000개
+MAX_CHILDREN_PER_REQUEST = 100
+MAX_BLOCKS_PER_REQUEST = 1000
+
+
+def _children(block: dict) -> list[dict]:
+    """블록의 하위 블록 목록."""
+    return block.get(block.get("type", ""), {}).get("children", []) or []
+
+
+def count_blocks(blocks: list[dict]) -> int:
+    """하위 블록 포함 전체 블록 수."""
+    return sum(1 + count_blocks(_children(b)) for b in blocks)
+
+
+def block_depth(block: dict) -> int:
+    """블록 중첩 깊이 (하위 블록 없으면 1)."""
+    children = _children(block)
+    return 1 + max((block_depth(c) for c in children), default=0)
+
+
+def _without_children(block: dict) -> dict:
+    """하위 블록을 제거한 사본."""
+    body = {k: v for k, v in block[block["type"]].items() if k != "children"}
+    return {**block, block["type"]: body}
+
+
+def _flatten(block: dict, max_depth: int) -> list[dict]:
+    """깊이 제한을 넘는 블록을 평탄화.
+
+    table/column_list 는 구조상 자식이 필요하므로 통째로 제외하고,
+    toggle 등은 자식을 같은 레벨로 끌어올린다.
+    """
+    if block_depth(block) <= max_depth:
+        return [block]
+    if block["type"] in ("table", "column_list", "column"):
+        return []
+    flat = [_without_children(block)]
+    for child in _children(block):
+        flat.extend(_flatten(child, max_depth))
+    return flat
+
+
+def fit_block_budget(blocks: list[dict], max_blocks: int | None = None, max_depth: int | None = None) -> list[dict]:
+    """블록 수/깊이 한도에 맞게 블록 목록 조정 (앞쪽 블록 우선, 초과분은 생략 안내)."""
+    if max_depth is not None:
+        blocks = [fb for b in blocks for fb in _flatten(b, max_depth)]
+    if max_blocks is None or count_blocks(blocks) <= max_blocks:
+        return blocks
+
+    fitted, used = [], 0
+    for block in blocks:
+        cost = count_blocks([block])
+        # 생략 안내 문단 1개 자리를 남겨둠
+        if used + cost > max_blocks - 1:
+            break
+        fitted.append(block)
+        used += cost
+    # 내용 없이 남은 제목은 제거
+    while fitted and fitted[-1]["type"].startswith("heading_"):
+        fitted.pop()
+    fitted.append({
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": [{
+                "type": "text",
+                "text": {"content": f"… 블록 한도({max_blocks}개)로 {len(blocks) - len(fitted)}개 섹션 생략"},
+                "annotations": {"color": "gray"},
+            }]
+        },
+    })
+    return fitted
+
+
+def batch_children(blocks: list[dict]) -> list[list[dict]]:
+    """append 요청 단위로 분할 (요청당 최상위 100개, 전체 1000개 이하)."""
+    batches, current, current_total = [], [], 0
+    for block in blocks:
+        cost = count_blocks([block])
+        if current and (len(current) >= MAX_CHILDREN_PER_REQUEST or current_total + cost > MAX_BLOCKS_PER_REQUEST):
+            batches.append(current)
+            current, current_total = [], 0
+        current.append(block)
+        current_total += cost
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,171 @@
+"""Notion 데이터베이스 스키마 캐시 및 속성 변환."""
+
+import json
+import os
+import time
+from typing import Any
+
+from checkpoint import STATE_DIR, write_json_atomic
+
+SCHEMA_TTL_SECONDS = 24 * 60 * 60
+
+
+class SchemaCache:
+    """databases.retrieve 결과(속성 스키마)를 last_edited_time 과 함께 디스크에 캐시."""
+
+    def __init__(self, database_id: str, path: str | None = None, ttl: float = SCHEMA_TTL_SECONDS) -> None:
+        """초기화."""
+        self.database_id = database_id
+        self.path = path or os.path.join(STATE_DIR, f"notion_schema_{database_id.replace('-', '')}.json")
+        self.ttl = ttl
+        self.entry: dict | None = self._load()
+
+    def _load(self) -> dict | None:
+        """디스크 캐시 로드."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("database_id") == self.database_id else None
+
+    def _save(self) -> None:
+        """디스크 캐시 저장 (임시 파일 후 교체)."""
+        write_json_atomic(self.path, self.entry)
+
+    def is_fresh(self) -> bool:
+        """TTL 이내 캐시 여부."""
+        return bool(self.entry) and time.time() - self.entry.get("fetched_at", 0) < self.ttl
+
+    def get(self, retrieve, refresh: bool = False) -> dict:
+        """스키마 반환 (신선하면 캐시, 아니면 retrieve() 호출 후 갱신).
+
+        반환값: {"last_edited_time": ..., "properties": {이름: {"type": ..., "options": [...]}}}
+        """
+        if self.is_fresh() and not refresh:
+            return self.entry
+
+        database = retrieve()
+        last_edited = database.get("last_edited_time")
+        if self.entry and self.entry.get("last_edited_time") == last_edited:
+            # 스키마 변경 없음 - 확인 시각만 갱신
+            self.entry["fetched_at"] = time.time()
+        else:
+            self.entry = {
+                "database_id": self.database_id,
+                "last_edited_time": last_edited,
+                "fetched_at": time.time(),
+                "properties": {
+                    name: {"type": prop["type"], "options": _option_names(prop)}
+                    for name, prop in database.get("properties", {}).items()
+                },
+            }
+        self._save()
+        return self.entry
+
+    def invalidate(self) -> None:
+        """다음 조회 시 재확인하도록 만료 처리."""
+        if self.entry:
+            self.entry["fetched_at"] = 0
+
+
+def _option_names(prop: dict) -> list[str]:
+    """select/multi_select/status 옵션 이름 목록."""
+    body = prop.get(prop.get("type"), {}) or {}
+    return [o["name"] for o in body.get("options", []) if "name" in o]
+
+
+def _plain_value(prop: dict) -> Any:
+    """전송용 속성 값에서 파이썬 값 추출 (number/텍스트/날짜)."""
+    if "number" in prop:
+        return prop["number"]
+    for key in ("title", "rich_text"):
+        if key in prop:
+            return "".join(t.get("text", {}).get("content", "") for t in prop[key])
+    if "select" in prop:
+        return (prop["select"] or {}).get("name")
+    if "date" in prop:
+        return prop["date"]
+    return None
+
+
+def _select_name(value: Any, options: list[str], prop_name: str) -> str:
+    """값에 맞는 select 옵션 이름 (기존 옵션 우선, 예: 11 → '11월')."""
+    text = str(value)
+    for candidate in (text, f"{text}월"):
+        if candidate in options:
+            return candidate
+    return f"{text}월" if "월" in prop_name and text.isdigit() else text
+
+
+def _convert(value: Any, target: str, prop_name: str, options: list[str]) -> dict | None:
+    """파이썬 값을 대상 속성 타입 형식으로 변환 (불가 시 None)."""
+    if value is None:
+        return None
+    if target == "number":
+        if isinstance(value, (int, float)):
+            return {"number": value}
+        try:
+            digits = str(value).replace(",", "").replace("원", "").replace("월", "").strip()
+            return {"number": float(digits) if "." in digits else int(digits)}
+        except ValueError:
+            return None
+    if target in ("rich_text", "title"):
+        text = value.get("start", "") if isinstance(value, dict) else str(value)
+        return {target: [{"type": "text", "text": {"content": text[:2000]}}]}
+    if target in ("select", "status"):
+        return {target: {"name": _select_name(value, options, prop_name)}}
+    if target == "multi_select":
+        return {"multi_select": [{"name": _select_name(value, options, prop_name)}]}
+    if target == "date":
+        return {"date": value} if isinstance(value, dict) else {"date": {"start": str(value)}}
+    return None
+
+
+def title_property(schema: dict) -> str | None:
+    """스키마의 title 속성 이름."""
+    for name, prop in schema["properties"].items():
+        if prop["type"] == "title":
+            return name
+    return None
+
+
+def shape_properties(properties: dict, schema: dict) -> dict:
+    """스키마에 맞게 속성 이름/타입 변환 (없는 속성·변환 불가 값은 경고 후 제외)."""
+    shaped = {}
+    schema_props = schema["properties"]
+    for name, prop in properties.items():
+        target_name = name
+        if "title" in prop:
+            # title 속성은 이름이 달라도 (예: "이름") 하나뿐이므로 그쪽으로 매핑
+            target_name = title_property(schema) or name
+        if target_name not in schema_props:
+            print(f"⚠️  데이터베이스에 '{name}' 속성이 없어 제외합니다.")
+            continue
+
+        target = schema_props[target_name]
+        current_type = next(iter(prop))
+        if current_type == target["type"]:
+            shaped[target_name] = prop
+            continue
+
+        converted = _convert(_plain_value(prop), target["type"], target_name, target["options"])
+        if converted is None:
+            print(f"⚠️  '{name}' 값을 {target['type']} 타입으로 변환할 수 없어 제외합니다.")
+            continue
+        shaped[target_name] = converted
+    return shaped
+
+
+def equals_filter(prop_name: str, value: Any, schema: dict) -> dict | None:
+    """속성 타입에 맞는 equals 필터 (속성이 없으면 None)."""
+    prop = schema["properties"].get(prop_name)
+    if not prop:
+        return None
+    if prop["type"] == "number":
+        return {"property": prop_name, "number": {"equals": value}}
+    if prop["type"] in ("select", "status"):
+        return {"property": prop_name, prop["type"]: {"equals": _select_name(value, prop["options"], prop_name)}}
+    if prop["type"] in ("rich_text", "title"):
+        return {"property": prop_name, prop["type"]: {"contains": str(value)}}
+    return None
@@ -1,22 +1,178 @@
 """Notion Dashboard Generator - 아파트 관리비 원장 (Design Optimized)."""
 
 import json
+import time
 from datetime import datetime
 from typing import Any
 
-from notion_client import Client
+import httpx
+from notion_client import APIErrorCode, APIResponseError, Client
+from notion_client.errors import RequestTimeoutError
+
+from billing import parse_amount
+from notion_blocks import batch_children, fit_block_budget
+from notion_schema import SchemaCache, equals_filter, shape_properties, title_property
+
+
+class RetryingClient(Client):
+    """429(rate_limited)/5xx 응답이면 Retry-After 만큼 기다렸다가 재시도하는 Notion 클라이언트.
+
+    429 는 서버가 처리하지 않은 요청이라 항상 재시도하지만, 5xx 는 서버에 반영됐을 수 있으므로
+    다시 보내도 결과가 같은 조회 요청(GET, 검색/query POST)만 재시도한다 (페이지 생성/블록 추가 중복 방지).
+    """
+
+    RATE_LIMIT_STATUS = 429
+    SERVER_ERROR_STATUSES = {500, 502, 503, 504}
+
+    def __init__(
+        self, *args: Any, max_retries: int = 3, max_wait_s: float = 30.0, budget_s: float | None = None, **kwargs: Any
+    ) -> None:
+        """초기화.
+
+        max_retries: 요청당 최대 재시도 횟수
+        max_wait_s: 재시도 1회 대기 상한 (Retry-After 가 더 길어도 이만큼만 대기)
+        budget_s: 클라이언트 전체 시간 예산 (남은 시간 안에 대기가 끝나지 않으면 재시도하지 않음)
+        """
+        super().__init__(*args, **kwargs)
+        self.max_retries = max_retries
+        self.max_wait_s = max_wait_s
+        self._budget_end = time.monotonic() + budget_s if budget_s else None
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "wait_s": 0.0}
+
+    @staticmethod
+    def _idempotent(method: str, path: str) -> bool:
+        """다시 보내도 안전한 조회 요청인지."""
+        method = method.upper()
+        path = path.rstrip("/")
+        return method == "GET" or (method == "POST" and (path.endswith("/query") or path == "search"))
+
+    def request(
+        self,
+        path: str,
+        method: str,
+        query: dict | None = None,
+        body: dict | None = None,
+        auth: str | None = None,
+    ) -> Any:
+        """요청 전송 (재시도 대상 응답은 대기 후 재전송, 한도 초과 시 마지막 응답으로 오류)."""
+        for attempt in range(self.max_retries + 1):
+            request = self._build_request(method, path, query, body, auth)
+            try:
+                response = self.client.send(request)
+            except httpx.TimeoutException:
+                raise RequestTimeoutError()
+            self.stats["requests"] += 1
+            status = response.status_code
+            if status == self.RATE_LIMIT_STATUS:
+                self.stats["rate_limited"] += 1
+            retryable = status == self.RATE_LIMIT_STATUS or (
+                status in self.SERVER_ERROR_STATUSES and self._idempotent(method, path)
+            )
+            if not retryable or attempt == self.max_retries:
+                return self._parse_response(response)
+
+            try:
+                wait = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                wait = 0.5 * 2 ** attempt
+            wait = min(max(wait, 0.0), self.max_wait_s)
+            if self._budget_end is not None and time.monotonic() + wait > self._budget_end:
+                # 기다리면 Notion 단계 예산을 넘기므로 마지막 응답으로 오류
+                return self._parse_response(response)
+            self.stats["retries"] += 1
+            self.stats["wait_s"] += wait
+            time.sleep(wait)
 
 
 class NotionSender:
     """Notion Database에 디자인된 대시보드 형식으로 데이터를 전송하는 클래스."""
 
-    def __init__(self, token: str, database_id: str) -> None:
-        """초기화."""
-        import httpx
+    # 레이아웃 모드별 기본 블록 한도 (None: 제한 없음)
+    RENDER_DEFAULTS = {
+        "rich": {"max_blocks": None, "max_depth": None},
+        "compact": {"max_blocks": 100, "max_depth": 2},
+    }
+
+    def __init__(
+        self,
+        token: str,
+        database_id: str,
+        timeout_ms: int | None = None,
+        render_mode: str = "rich",
+        max_blocks: int | None = None,
+        max_depth: int | None = None,
+        base_url: str | None = None,
+        max_retries: int = 3,
+    ) -> None:
+        """초기화.
+
+        timeout_ms: 요청별 타임아웃 (기본 60초, 지정 시 재시도 대기를 포함한 전체 예산으로도 사용)
+        base_url: API 주소 (기본 https://api.notion.com, 로컬 대역 서버 테스트용)
+        max_retries: 429/5xx 응답 시 재시도 횟수 (Retry-After 준수, 5xx 는 조회 요청만)
+        render_mode: "rich" (기존 2열/callout 레이아웃) 또는 "compact" (표 중심, 얕은 구조)
+        max_blocks/max_depth: 본문 블록 수/중첩 깊이 한도 (미지정 시 모드 기본값)
+        """
+        if render_mode not in self.RENDER_DEFAULTS:
+            raise ValueError(f"알 수 없는 레이아웃: {render_mode}")
         # SSL 인증서 검증 우회 (회사 네트워크 환경 대응)
         client = httpx.Client(verify=False)
-        self.notion = Client(auth=token, client=client)
+        options = {"timeout_ms": timeout_ms} if timeout_ms else {}
+        if base_url:
+            options["base_url"] = base_url.rstrip("/")
+        self.notion = RetryingClient(
+            auth=token,
+            client=client,
+            max_retries=max_retries,
+            budget_s=timeout_ms / 1000 if timeout_ms else None,
+            **options,
+        )
         self.database_id = database_id
+        self.schema_cache = SchemaCache(database_id)
+        self.render_mode = render_mode
+        for name, value in (("max_blocks", max_blocks), ("max_depth", max_depth)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} 는 1 이상이어야 합니다: {value}")
+        defaults = self.RENDER_DEFAULTS[render_mode]
+        self.max_blocks = defaults["max_blocks"] if max_blocks is None else max_blocks
+        self.max_depth = defaults["max_depth"] if max_depth is None else max_depth
+
+    def get_schema(self, refresh: bool = False) -> dict | None:
+        """데이터베이스 스키마 (디스크 캐시 사용, 조회 실패 시 None)."""
+        try:
+            return self.schema_cache.get(
+                lambda: self.notion.databases.retrieve(database_id=self.database_id), refresh
+            )
+        except Exception as e:
+            print(f"데이터베이스 스키마 조회 실패: {e}")
+            return None
+
+    def shape_properties(self, properties: dict[str, Any]) -> dict[str, Any]:
+        """스키마에 맞춰 속성 변환 (스키마를 모르면 그대로 전송)."""
+        schema = self.get_schema()
+        return shape_properties(properties, schema) if schema else properties
+
+    def create_page(self, properties: dict[str, Any]) -> dict:
+        """스키마에 맞춘 속성으로 페이지 생성.
+
+        검증 오류 시 스키마를 다시 확인하고, 변경되었으면 한 번 더 시도한다.
+        """
+        try:
+            return self.notion.pages.create(
+                parent={"database_id": self.database_id},
+                properties=self.shape_properties(properties),
+            )
+        except APIResponseError as e:
+            if e.code != APIErrorCode.ValidationError:
+                raise
+            cached = self.schema_cache.entry or {}
+            schema = self.get_schema(refresh=True)
+            if not schema or schema.get("last_edited_time") == cached.get("last_edited_time"):
+                raise
+            print("데이터베이스 스키마 변경 감지, 속성 재구성 후 재시도")
+            return self.notion.pages.create(
+                parent={"database_id": self.database_id},
+                properties=shape_properties(properties, schema),
+            )
 
     def format_currency(self, amount: str | int) -> str:
         """금액 포맷팅 (콤마 추가)."""
@@ -27,15 +183,6 @@ class NotionSender:
         except (ValueError, TypeError):
             return "0"
 
-    def parse_int(self, value: Any) -> int:
-        """안전한 정수 변환."""
-        try:
-            if isinstance(value, str):
-                return int(value.replace(",", "").replace("원", ""))
-            return int(value)
-        except (ValueError, TypeError):
-            return 0
-
     def parse_date(self, date_str: str) -> str | None:
         """날짜 문자열을 Notion Date 형식으로 변환."""
         if not date_str:
@@ -67,7 +214,7 @@ class NotionSender:
         for energy in energy_category:
             energy_type = energy.get("type", "")
             cost_str = energy.get("cost", "0")
-            cost = self.parse_int(cost_str)
+            cost = parse_amount(cost_str)
             
             if "전기" in energy_type:
                 costs["전기"] = cost
@@ -94,7 +241,7 @@ class NotionSender:
             ho = dong_ho[4:].lstrip("0") if len(dong_ho) > 4 else ""
             dong_ho_str = f"{dong}동 {ho}호" if dong and ho else dong_ho
             
-            amount = self.parse_int(maint_payment.get("amount", 0))
+            amount = parse_amount(maint_payment.get("amount", 0))
             month_str = maint_payment.get("month", str(datetime.now().month))
             deadline_str = maint_payment.get("deadline", "")
             maint_status = maint_payment.get("status", "")
@@ -211,7 +358,7 @@ class NotionSender:
                     m = billing_month.split(".")[-1]
                 else:
                     m = ""
-                amt = self.parse_int(h.get("amount", 0)) // 10000  # 만원 단위
+                amt = parse_amount(h.get("amount", 0)) // 10000  # 만원 단위
                 if m:
                     trend_texts.append(f"{int(m)}월: {amt}만")
             trend_str = " | ".join(trend_texts) if trend_texts else "데이터 없음"
@@ -260,316 +407,459 @@ class NotionSender:
 
             children.append(header_callout)
 
-            # 3.2 Energy & Comparison (2-Column Layout) - 맨 위로 이동
-            # Column 1: Usage & Cost
-            col1_children = [
-                {"object": "block", "type": "heading_3", "heading_3": {"rich_text": [{"text": {"content": "⚡ 에너지 및 주요 지출"}}]}}
-            ]
-            
-            for energy in energy_category:
-                e_type = energy.get("type", "")
-                usage = energy.get("usage", "0")
-                cost = energy.get("cost", "0")
-                cost_int = self.parse_int(cost)
-                
-                col1_children.append({
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [
-                            {"type": "text", "text": {"content": f"{e_type}: {usage}"}}
-                        ],
-                        "children": [
-                            {
-                                "object": "block",
-                                "type": "paragraph",
-                                "paragraph": {
-                                    "rich_text": [
-                                        {"type": "text", "text": {"content": f"비용: {self.format_currency(cost_int)}원"}}
-                                    ]
-                                }
-                            }
-                        ]
-                    }
-                })
+            # 3.2 ~ 3.4 본문 (레이아웃 모드별)
+            if self.render_mode == "compact":
+                children.extend(self._build_compact_blocks(data, maint_items, energy_category, payment_history))
+            else:
+                children.extend(self._build_rich_blocks(data, maint_items, energy_category, payment_history))
+            if self.max_blocks is not None or self.max_depth is not None:
+                children = fit_block_budget(children, self.max_blocks, self.max_depth)
 
-            # Column 2: Neighbor Comparison
-            col2_children = [
-                {"object": "block", "type": "heading_3", "heading_3": {"rich_text": [{"text": {"content": "📊 이웃 평균 비교"}}]}}
-            ]
-            
-            for energy in energy_category:
-                comp_text = energy.get("comparison", "")
-                if comp_text:
-                    col2_children.append({
-                        "object": "block",
-                        "type": "callout",
-                        "callout": {
-                            "icon": {"emoji": "💬"},
-                            "color": "blue_background",
-                            "rich_text": [{"type": "text", "text": {"content": comp_text}}]
-                        }
-                    })
 
-            children.append({
+            # --- 4. 페이지 생성 요청 ---
+            # 먼저 properties만으로 페이지 생성
+            response = self.create_page(properties)
+            
+            # 페이지 생성 후 children 추가
+            if children:
+                page_id = response.get("id")
+                # children을 추가하기 위해 페이지 업데이트
+                # Notion API는 페이지 생성 시 children을 함께 전달할 수 있지만,
+                # 문제가 있을 경우 별도로 추가
+                # 요청당 블록 한도에 맞춰 나누어 추가
+                for batch in batch_children(children):
+                    try:
+                        # append_block_children 사용 (notion-client 2.x)
+                        self.notion.blocks.children.append(
+                            block_id=page_id,
+                            children=batch
+                        )
+                    except:
+                        # append가 실패하면 각 블록을 개별적으로 추가
+                        for child in batch:
+                            try:
+                                self.notion.blocks.children.append(
+                                    block_id=page_id,
+                                    children=[child]
+                                )
+                            except:
+                                pass
+            print(f"Notion Page Created: {response.get('url')}")
+            return True
+
+        except Exception as e:
+            print(f"Error creating page: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+    def _table(self, header: list[str], rows: list[list[str]]) -> dict:
+        """헤더 포함 단순 표 블록."""
+        def row_block(cells: list[str]) -> dict:
+            return {
                 "object": "block",
-                "type": "column_list",
-                "column_list": {
-                    "children": [
-                        {"object": "block", "type": "column", "column": {"children": col1_children}},
-                        {"object": "block", "type": "column", "column": {"children": col2_children}}
+                "type": "table_row",
+                "table_row": {"cells": [[{"type": "text", "text": {"content": c}}] for c in cells]},
+            }
+
+        return {
+            "object": "block",
+            "type": "table",
+            "table": {
+                "table_width": len(header),
+                "has_column_header": True,
+                "has_row_header": False,
+                "children": [row_block(header)] + [row_block(r) for r in rows],
+            },
+        }
+
+    def _build_compact_blocks(
+        self,
+        data: dict[str, Any],
+        maint_items: list[dict],
+        energy_category: list[dict],
+        payment_history: list[dict],
+    ) -> list[dict]:
+        """간결(compact) 레이아웃: 에너지/관리비/납부 기록을 각각 표 하나로 (깊이 2 이하)."""
+        def heading(text: str) -> dict:
+            return {"object": "block", "type": "heading_3", "heading_3": {"rich_text": [{"text": {"content": text}}]}}
+
+        children = []
+        if energy_category:
+            children.append(heading("⚡ 에너지 및 이웃 평균 비교"))
+            children.append(self._table(
+                ["구분", "사용량", "비용", "이웃 비교"],
+                [
+                    [
+                        e.get("type", ""),
+                        e.get("usage", "0"),
+                        f"{self.format_currency(parse_amount(e.get('cost', 0)))}원",
+                        e.get("comparison", ""),
                     ]
-                }
-            })
+                    for e in energy_category
+                ],
+            ))
 
-            children.append({"object": "block", "type": "divider", "divider": {}})
+        if maint_items:
+            sorted_items = sorted(maint_items, key=lambda x: parse_amount(x.get("current", 0)), reverse=True)
+            rows = []
+            for item in sorted_items:
+                change = parse_amount(item.get("change", 0))
+                trend = f"🔺 +{self.format_currency(change)}" if change > 0 else (
+                    f"🔽 {self.format_currency(change)}" if change < 0 else "-"
+                )
+                rows.append([
+                    item.get("item", ""),
+                    f"{self.format_currency(parse_amount(item.get('current', 0)))}원",
+                    f"{self.format_currency(parse_amount(item.get('previous', 0)))}원",
+                    trend,
+                ])
+            children.append(heading("📑 명세서 상세 항목"))
+            children.append(self._table(["항목", "당월", "전월", "증감"], rows))
 
-            # 3.3 Detailed Fee Table (Toggle Block) - 중앙에 위치, 가로 2열 레이아웃
-            # 항목 정렬: 당월 금액 기준 내림차순
-            sorted_items = sorted(
-                maint_items, 
-                key=lambda x: self.parse_int(x.get("current", 0)), 
-                reverse=True
-            )
+        if payment_history:
+            children.append(heading("🕒 최근 6개월 납부 기록"))
+            children.append(self._table(
+                ["납기월", "결제일", "금액", "상태"],
+                [
+                    [
+                        h.get("billing_month", ""),
+                        h.get("date", ""),
+                        f"{self.format_currency(parse_amount(h.get('amount', 0)))}원",
+                        h.get("status", ""),
+                    ]
+                    for h in payment_history[:6]
+                ],
+            ))
+        return children
 
-            # 가로 2열로 항목 분할
-            left_column_items = []
-            right_column_items = []
-            
-            for i, item in enumerate(sorted_items):
-                name = item.get("item", "")
-                curr = self.parse_int(item.get("current", 0))
-                change = self.parse_int(item.get("change", 0))
-                
-                # Trend Display Logic
-                if change > 0:
-                    trend_text = f"🔺 +{self.format_currency(change)}원"
-                    trend_color = "red"
-                elif change < 0:
-                    trend_text = f"🔽 {self.format_currency(change)}원"
-                    trend_color = "blue"
-                else:
-                    trend_text = "-"
-                    trend_color = "gray"
-                
-                # 항목 정보를 Callout 형식으로 구성
-                item_block = {
-                    "object": "block",
-                    "type": "callout",
-                    "callout": {
-                        "icon": {"emoji": "💰"},
-                        "color": "gray_background",
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": f"{name}\n"},
-                                "annotations": {"bold": True}
-                            },
-                            {
-                                "type": "text",
-                                "text": {"content": f"당월: {self.format_currency(curr)}원\n"}
-                            },
-                            {
-                                "type": "text",
-                                "text": {"content": f"증감: "}
-                            },
-                            {
-                                "type": "text",
-                                "text": {"content": trend_text},
-                                "annotations": {"color": trend_color}
-                            }
-                        ]
-                    }
-                }
-                
-                # 짝수 인덱스는 왼쪽, 홀수 인덱스는 오른쪽
-                if i % 2 == 0:
-                    left_column_items.append(item_block)
-                else:
-                    right_column_items.append(item_block)
-            
-            # 2-컬럼 레이아웃 생성
-            detail_col1 = left_column_items
-            detail_col2 = right_column_items
-            
-            # 토글 내부에 직접 callout 블록들을 나열
-            # Notion API가 toggle 내부의 column_list를 지원하지 않으므로
-            # 모든 항목을 순서대로 나열 (왼쪽 컬럼 먼저, 그 다음 오른쪽 컬럼)
-            toggle_children = []
-            max_len = max(len(detail_col1), len(detail_col2))
-            for i in range(max_len):
-                if i < len(detail_col1):
-                    toggle_children.append(detail_col1[i])
-                if i < len(detail_col2):
-                    toggle_children.append(detail_col2[i])
-            
-            children.append({
+    def _build_rich_blocks(
+        self,
+        data: dict[str, Any],
+        maint_items: list[dict],
+        energy_category: list[dict],
+        payment_history: list[dict],
+    ) -> list[dict]:
+        """기본(rich) 레이아웃: 2열 에너지 비교, 항목별 callout, 토글 아카이브."""
+        children = []
+
+        # 3.2 Energy & Comparison (2-Column Layout) - 맨 위로 이동
+        # Column 1: Usage & Cost
+        col1_children = [
+            {"object": "block", "type": "heading_3", "heading_3": {"rich_text": [{"text": {"content": "⚡ 에너지 및 주요 지출"}}]}}
+        ]
+        
+        for energy in energy_category:
+            e_type = energy.get("type", "")
+            usage = energy.get("usage", "0")
+            cost = energy.get("cost", "0")
+            cost_int = parse_amount(cost)
+            
+            col1_children.append({
                 "object": "block",
-                "type": "toggle",
-                "toggle": {
-                    "rich_text": [{"type": "text", "text": {"content": "📑 명세서 상세 항목"}}],
-                    "children": toggle_children
+                "type": "bulleted_list_item",
+                # column_list > column > 항목까지가 요청당 허용 중첩(2단계)이므로 비용은 하위 블록 대신 같은 블록에 줄바꿈
+                "bulleted_list_item": {
+                    "rich_text": [
+                        {"type": "text", "text": {"content": f"{e_type}: {usage}\n"}},
+                        {"type": "text", "text": {"content": f"비용: {self.format_currency(cost_int)}원"}, "annotations": {"color": "gray"}},
+                    ],
                 }
             })
-            
-            children.append({"object": "block", "type": "divider", "divider": {}})
 
-            # 3.4 Archive (Toggle Blocks)
-            # Toggle 1: Payment History
-            history_rows = [
-                {
-                    "object": "block",
-                    "type": "table_row",
-                    "table_row": {
-                        "cells": [
-                            [{"type": "text", "text": {"content": "납기월"}}],
-                            [{"type": "text", "text": {"content": "결제일"}}],
-                            [{"type": "text", "text": {"content": "금액"}}],
-                            [{"type": "text", "text": {"content": "상태"}}]
-                        ]
-                    }
-                }
-            ]
-            
-            for h in payment_history[:6]:
-                h_month = h.get("billing_month", "")
-                h_date = h.get("date", "")
-                h_amt = self.format_currency(self.parse_int(h.get("amount", 0)))
-                h_status = h.get("status", "")
-                
-                s_color = "blue" if "완료" in h_status else "default"
-                
-                history_rows.append({
+        # Column 2: Neighbor Comparison
+        col2_children = [
+            {"object": "block", "type": "heading_3", "heading_3": {"rich_text": [{"text": {"content": "📊 이웃 평균 비교"}}]}}
+        ]
+        
+        for energy in energy_category:
+            comp_text = energy.get("comparison", "")
+            if comp_text:
+                col2_children.append({
                     "object": "block",
-                    "type": "table_row",
-                    "table_row": {
-                        "cells": [
-                            [{"type": "text", "text": {"content": h_month}}],
-                            [{"type": "text", "text": {"content": h_date}}],
-                            [{"type": "text", "text": {"content": f"{h_amt}원"}}],
-                            [{"type": "text", "text": {"content": h_status}, "annotations": {"color": s_color}}]
-                        ]
+                    "type": "callout",
+                    "callout": {
+                        "icon": {"emoji": "💬"},
+                        "color": "blue_background",
+                        "rich_text": [{"type": "text", "text": {"content": comp_text}}]
                     }
                 })
 
-            children.append({
+        children.append({
+            "object": "block",
+            "type": "column_list",
+            "column_list": {
+                "children": [
+                    {"object": "block", "type": "column", "column": {"children": col1_children}},
+                    {"object": "block", "type": "column", "column": {"children": col2_children}}
+                ]
+            }
+        })
+
+        children.append({"object": "block", "type": "divider", "divider": {}})
+
+        # 3.3 Detailed Fee Table (Toggle Block) - 중앙에 위치, 가로 2열 레이아웃
+        # 항목 정렬: 당월 금액 기준 내림차순
+        sorted_items = sorted(
+            maint_items, 
+            key=lambda x: parse_amount(x.get("current", 0)), 
+            reverse=True
+        )
+
+        # 가로 2열로 항목 분할
+        left_column_items = []
+        right_column_items = []
+        
+        for i, item in enumerate(sorted_items):
+            name = item.get("item", "")
+            curr = parse_amount(item.get("current", 0))
+            change = parse_amount(item.get("change", 0))
+            
+            # Trend Display Logic
+            if change > 0:
+                trend_text = f"🔺 +{self.format_currency(change)}원"
+                trend_color = "red"
+            elif change < 0:
+                trend_text = f"🔽 {self.format_currency(change)}원"
+                trend_color = "blue"
+            else:
+                trend_text = "-"
+                trend_color = "gray"
+            
+            # 항목 정보를 Callout 형식으로 구성
+            item_block = {
                 "object": "block",
-                "type": "toggle",
-                "toggle": {
-                    "rich_text": [{"type": "text", "text": {"content": "🕒 최근 6개월 납부 기록"}}],
-                    "children": [{
-                        "object": "block",
-                        "type": "table",
-                        "table": {
-                            "table_width": 4,
-                            "has_column_header": True,
-                            "has_row_header": False,
-                            "children": history_rows
+                "type": "callout",
+                "callout": {
+                    "icon": {"emoji": "💰"},
+                    "color": "gray_background",
+                    "rich_text": [
+                        {
+                            "type": "text",
+                            "text": {"content": f"{name}\n"},
+                            "annotations": {"bold": True}
+                        },
+                        {
+                            "type": "text",
+                            "text": {"content": f"당월: {self.format_currency(curr)}원\n"}
+                        },
+                        {
+                            "type": "text",
+                            "text": {"content": f"증감: "}
+                        },
+                        {
+                            "type": "text",
+                            "text": {"content": trend_text},
+                            "annotations": {"color": trend_color}
                         }
-                    }]
+                    ]
+                }
+            }
+            
+            # 짝수 인덱스는 왼쪽, 홀수 인덱스는 오른쪽
+            if i % 2 == 0:
+                left_column_items.append(item_block)
+            else:
+                right_column_items.append(item_block)
+        
+        # 2-컬럼 레이아웃 생성
+        detail_col1 = left_column_items
+        detail_col2 = right_column_items
+        
+        # 토글 내부에 직접 callout 블록들을 나열
+        # Notion API가 toggle 내부의 column_list를 지원하지 않으므로
+        # 모든 항목을 순서대로 나열 (왼쪽 컬럼 먼저, 그 다음 오른쪽 컬럼)
+        toggle_children = []
+        max_len = max(len(detail_col1), len(detail_col2))
+        for i in range(max_len):
+            if i < len(detail_col1):
+                toggle_children.append(detail_col1[i])
+            if i < len(detail_col2):
+                toggle_children.append(detail_col2[i])
+        
+        children.append({
+            "object": "block",
+            "type": "toggle",
+            "toggle": {
+                "rich_text": [{"type": "text", "text": {"content": "📑 명세서 상세 항목"}}],
+                "children": toggle_children
+            }
+        })
+        
+        children.append({"object": "block", "type": "divider", "divider": {}})
+
+        # 3.4 Archive (Toggle Blocks)
+        # Toggle 1: Payment History
+        history_rows = [
+            {
+                "object": "block",
+                "type": "table_row",
+                "table_row": {
+                    "cells": [
+                        [{"type": "text", "text": {"content": "납기월"}}],
+                        [{"type": "text", "text": {"content": "결제일"}}],
+                        [{"type": "text", "text": {"content": "금액"}}],
+                        [{"type": "text", "text": {"content": "상태"}}]
+                    ]
+                }
+            }
+        ]
+        
+        for h in payment_history[:6]:
+            h_month = h.get("billing_month", "")
+            h_date = h.get("date", "")
+            h_amt = self.format_currency(parse_amount(h.get("amount", 0)))
+            h_status = h.get("status", "")
+            
+            s_color = "blue" if "완료" in h_status else "default"
+            
+            history_rows.append({
+                "object": "block",
+                "type": "table_row",
+                "table_row": {
+                    "cells": [
+                        [{"type": "text", "text": {"content": h_month}}],
+                        [{"type": "text", "text": {"content": h_date}}],
+                        [{"type": "text", "text": {"content": f"{h_amt}원"}}],
+                        [{"type": "text", "text": {"content": h_status}, "annotations": {"color": s_color}}]
+                    ]
                 }
             })
 
-            # Toggle 2: Original Bill (JSON 데이터 - 여러 블록으로 분할)
-            json_data = json.dumps(data, ensure_ascii=False, indent=2)
-            toggle2_children = []
-            
-            # 2000자씩 분할하여 여러 code 블록 생성
-            max_length = 1900  # 안전 마진
-            if len(json_data) > max_length:
-                chunks = [json_data[i:i+max_length] for i in range(0, len(json_data), max_length)]
-                for i, chunk in enumerate(chunks):
-                    toggle2_children.append({
-                        "object": "block",
-                        "type": "code",
-                        "code": {
-                            "rich_text": [{"type": "text", "text": {"content": chunk}}],
-                            "language": "json"
-                        }
-                    })
-            else:
+        children.append({
+            "object": "block",
+            "type": "toggle",
+            "toggle": {
+                "rich_text": [{"type": "text", "text": {"content": "🕒 최근 6개월 납부 기록"}}],
+                "children": [{
+                    "object": "block",
+                    "type": "table",
+                    "table": {
+                        "table_width": 4,
+                        "has_column_header": True,
+                        "has_row_header": False,
+                        "children": history_rows
+                    }
+                }]
+            }
+        })
+
+        # Toggle 2: Original Bill (JSON 데이터 - 여러 블록으로 분할)
+        json_data = json.dumps(data, ensure_ascii=False, indent=2)
+        toggle2_children = []
+        
+        # 2000자씩 분할하여 여러 code 블록 생성
+        max_length = 1900  # 안전 마진
+        if len(json_data) > max_length:
+            chunks = [json_data[i:i+max_length] for i in range(0, len(json_data), max_length)]
+            for i, chunk in enumerate(chunks):
                 toggle2_children.append({
                     "object": "block",
                     "type": "code",
                     "code": {
-                        "rich_text": [{"type": "text", "text": {"content": json_data}}],
+                        "rich_text": [{"type": "text", "text": {"content": chunk}}],
                         "language": "json"
                     }
                 })
-            
-            children.append({
+        else:
+            toggle2_children.append({
                 "object": "block",
-                "type": "toggle",
-                "toggle": {
-                    "rich_text": [{"type": "text", "text": {"content": "📎 고지서 원본"}}],
-                    "children": toggle2_children
+                "type": "code",
+                "code": {
+                    "rich_text": [{"type": "text", "text": {"content": json_data}}],
+                    "language": "json"
                 }
             })
+        
+        children.append({
+            "object": "block",
+            "type": "toggle",
+            "toggle": {
+                "rich_text": [{"type": "text", "text": {"content": "📎 고지서 원본"}}],
+                "children": toggle2_children
+            }
+        })
 
-            # --- 4. 페이지 생성 요청 ---
-            # 먼저 properties만으로 페이지 생성
-            response = self.notion.pages.create(
-                parent={"database_id": self.database_id},
-                properties=properties
-            )
-            
-            # 페이지 생성 후 children 추가
-            if children:
-                page_id = response.get("id")
-                # children을 추가하기 위해 페이지 업데이트
-                # Notion API는 페이지 생성 시 children을 함께 전달할 수 있지만,
-                # 문제가 있을 경우 별도로 추가
-                try:
-                    # append_block_children 사용 (notion-client 2.x)
-                    self.notion.blocks.children.append(
-                        block_id=page_id,
-                        children=children
-                    )
-                except:
-                    # append가 실패하면 각 블록을 개별적으로 추가
-                    for child in children:
-                        try:
-                            self.notion.blocks.children.append(
-                                block_id=page_id,
-                                children=[child]
-                            )
-                        except:
-                            pass
-            print(f"Notion Page Created: {response.get('url')}")
-            return True
+        return children
 
+    def create_rollup_page(self, summary: dict[str, Any], replace_page_id: str | None = None) -> str | None:
+        """단지 월 요약 페이지 생성 (replace_page_id 가 있으면 이전 페이지는 보관 처리). 페이지 ID 반환."""
+        try:
+            stats = summary["stats"]
+            title = f"{summary['period']} {summary['complex']} 단지 요약"
+
+            def won(value: float) -> str:
+                return f"{self.format_currency(int(round(value)))}원"
+
+            amount = stats.get("amount", {})
+            children = [{
+                "object": "block",
+                "type": "callout",
+                "callout": {
+                    "icon": {"emoji": "🏢"},
+                    "color": "gray_background",
+                    "rich_text": [{
+                        "type": "text",
+                        "text": {"content": (
+                            f"{summary['period']} 집계 세대 {amount.get('n', 0)}곳\n"
+                            f"평균 {won(amount.get('mean', 0))} · 중앙값 {won(amount.get('median', 0))}"
+                        )},
+                    }],
+                },
+            }]
+
+            stat_rows = []
+            for key in ["amount"] + sorted(k for k in stats if k.startswith("energy:")) + sorted(
+                (k for k in stats if k.startswith("item:")), key=lambda k: -stats[k]["median"]
+            ):
+                s = stats[key]
+                label = "총 관리비" if key == "amount" else key.split(":", 1)[1]
+                stat_rows.append([label, str(s["n"]), won(s["mean"]), won(s["median"]), won(s["p25"]), won(s["p75"]), won(s["p90"])])
+            children.append(self._table(["항목", "세대", "평균", "중앙값", "P25", "P75", "P90"], stat_rows))
+
+            if summary["dongs"]:
+                children.append({"object": "block", "type": "heading_3", "heading_3": {"rich_text": [{"text": {"content": "동별 총 관리비"}}]}})
+                children.append(self._table(
+                    ["동", "세대", "평균", "중앙값"],
+                    [[f"{dong}동", str(s["n"]), won(s["mean"]), won(s["median"])] for dong, s in summary["dongs"].items()],
+                ))
+
+            response = self.create_page({"Name": {"title": [{"type": "text", "text": {"content": title}}]}})
+            for batch in batch_children(children):
+                self.notion.blocks.children.append(block_id=response["id"], children=batch)
+            if replace_page_id:
+                self.notion.pages.update(page_id=replace_page_id, archived=True)
+            print(f"Rollup Page Created: {response.get('url')}")
+            return response["id"]
         except Exception as e:
-            print(f"Error creating page: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+            print(f"Error creating rollup page: {e}")
+            return None
 
     def check_month_exists(self, year: int, month: int) -> bool:
         """해당 연도/월의 데이터가 이미 존재하는지 확인."""
         try:
-            # Notion 데이터베이스에서 해당 월의 페이지 검색
-            response = self.notion.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "and": [
-                        {
-                            "property": "청구월",
-                            "number": {
-                                "equals": month
-                            }
-                        }
-                    ]
-                }
-            )
-            
-            # 결과 확인
-            results = response.get("results", [])
+            # Notion 데이터베이스에서 해당 월의 페이지 검색 (청구월 타입에 맞는 필터 사용)
+            schema = self.get_schema()
+            month_filter = {"property": "청구월", "number": {"equals": month}}
+            title_name = "Name"
+            if schema:
+                month_filter = equals_filter("청구월", month, schema) or month_filter
+                title_name = title_property(schema) or title_name
+            # 같은 월이 여러 해에 걸쳐 있으면 100건을 넘을 수 있으므로 끝까지 페이지 넘김
+            results = []
+            query = {"database_id": self.database_id, "filter": {"and": [month_filter]}, "page_size": 100}
+            while True:
+                response = self.notion.databases.query(**query)
+                results.extend(response.get("results", []))
+                if not response.get("has_more"):
+                    break
+                query["start_cursor"] = response["next_cursor"]
             if not results:
                 return False
             
             # 제목에서 연도 확인
             for page in results:
-                title_prop = page.get("properties", {}).get("Name", {})
+                title_prop = page.get("properties", {}).get(title_name, {})
                 title_array = title_prop.get("title", [])
                 if title_array:
                     title_text = title_array[0].get("plain_text", "")
@@ -0,0 +1,64 @@
+"""세대별 납부 내역 로컬 원장 (마지막으로 알고 있는 납부 이후 행만 추가 수집하기 위한 상태 파일)."""
+
+import json
+import os
+from datetime import datetime
+
+from checkpoint import STATE_DIR, account_key, write_json_atomic
+
+
+def default_ledger_path(user_id: str) -> str:
+    """계정별 기본 원장 경로."""
+    return os.path.join(STATE_DIR, f"payments_{account_key(user_id)}.json")
+
+
+def row_key(row: dict) -> tuple[str, str, str]:
+    """납부 행 식별 키 (납부일, 청구월, 금액)."""
+    return (row.get("date", ""), row.get("billing_month", ""), str(row.get("amount", "")).replace(",", ""))
+
+
+class PaymentLedger:
+    """납부 내역 원장 (최신순)."""
+
+    def __init__(self, path: str) -> None:
+        """초기화 (파일이 있으면 로드)."""
+        self.path = path
+        self.state = {"updated_at": None, "rows": []}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"납부 원장 로드 실패, 전체 수집: {e}")
+
+    @property
+    def rows(self) -> list[dict]:
+        """전체 납부 내역 (최신순)."""
+        return self.state["rows"]
+
+    @property
+    def last_known(self) -> dict | None:
+        """가장 최근에 알고 있는 납부 (date, billing_month, amount)."""
+        if not self.rows:
+            return None
+        date, billing_month, amount = row_key(self.rows[0])
+        return {"date": date, "billing_month": billing_month, "amount": amount}
+
+    def save(self) -> None:
+        """상태 저장 (임시 파일 후 교체)."""
+        self.state["updated_at"] = datetime.now().isoformat()
+        write_json_atomic(self.path, self.state)
+
+    def replace(self, rows: list[dict]) -> None:
+        """전체 수집 결과로 원장 교체."""
+        self.state["rows"] = list(rows)
+        self.save()
+
+    def merge(self, new_rows: list[dict]) -> int:
+        """새 행을 원장 앞에 추가 (이미 있는 행은 제외). 추가된 행 수 반환."""
+        known = {row_key(r) for r in self.rows}
+        added = [r for r in new_rows if row_key(r) not in known]
+        if added:
+            self.state["rows"] = added + self.rows
+            self.save()
+        return len(added)
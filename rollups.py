@@ -0,0 +1,147 @@
+"""단지/동 단위 관리비 집계 (세대 결과가 들어올 때마다 증분 갱신).
+
+집계 키별로 정렬된 값 목록을 유지하므로 평균·중앙값·백분위를 전체 재계산 없이 바로 읽을 수 있다.
+같은 세대가 다시 들어오면 이전 값을 빼고 새 값을 넣는다.
+"""
+
+import bisect
+import json
+import os
+
+from apti_site import default_complex_key
+from billing import billing_period, parse_amount
+from checkpoint import STATE_DIR, write_json_atomic
+
+
+def household_values(data: dict) -> dict[str, int]:
+    """세대 결과에서 집계 대상 값 추출 (총액, 항목별 당월, 에너지별 비용)."""
+    values = {"amount": parse_amount(data.get("maint_payment", {}).get("amount"))}
+    for item in data.get("maint_items", []):
+        if item.get("item"):
+            values[f"item:{item['item']}"] = parse_amount(item.get("current"))
+    for energy in data.get("energy_category", []):
+        if energy.get("type"):
+            values[f"energy:{energy['type']}"] = parse_amount(energy.get("cost"))
+    return values
+
+
+def _percentile(sorted_values: list[int], q: float) -> float:
+    """정렬된 목록의 백분위 (선형 보간)."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+class Rollup:
+    """집계 단위 하나 (예: 단지 2025.11, 1306동 2025.11)."""
+
+    def __init__(self, state: dict | None = None) -> None:
+        """초기화 (저장된 상태 복원)."""
+        state = state or {}
+        self.members: dict[str, dict[str, int]] = state.get("members", {})
+        self.sums: dict[str, int] = state.get("sums", {})
+        self.sorted: dict[str, list[int]] = state.get("sorted", {})
+
+    def to_state(self) -> dict:
+        """저장용 상태."""
+        return {"members": self.members, "sums": self.sums, "sorted": self.sorted}
+
+    def update(self, household: str, values: dict[str, int]) -> None:
+        """세대 값 반영 (기존 값이 있으면 교체)."""
+        for key, value in self.members.get(household, {}).items():
+            values_list = self.sorted[key]
+            del values_list[bisect.bisect_left(values_list, value)]
+            self.sums[key] -= value
+        for key, value in values.items():
+            bisect.insort(self.sorted.setdefault(key, []), value)
+            self.sums[key] = self.sums.get(key, 0) + value
+        self.members[household] = values
+
+    def stats(self) -> dict[str, dict]:
+        """키별 통계 (세대 수, 평균, 중앙값, 사분위, 90백분위, 최소/최대)."""
+        result = {}
+        for key, values in self.sorted.items():
+            if not values:
+                continue
+            result[key] = {
+                "n": len(values),
+                "mean": round(self.sums[key] / len(values), 1),
+                "median": _percentile(values, 0.5),
+                "p25": _percentile(values, 0.25),
+                "p75": _percentile(values, 0.75),
+                "p90": _percentile(values, 0.9),
+                "min": values[0],
+                "max": values[-1],
+            }
+        return result
+
+
+class RollupStore:
+    """단지별/동별 월 집계 저장소."""
+
+    def __init__(self, path: str | None = None) -> None:
+        """초기화."""
+        self.path = path or os.path.join(STATE_DIR, "rollups.json")
+        self.state = {"rollups": {}, "published": {}}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.state.update(json.load(f))
+
+    def save(self) -> None:
+        """상태 저장 (임시 파일 후 교체)."""
+        write_json_atomic(self.path, self.state, indent=None)
+
+    @staticmethod
+    def key(complex_key: str, period: str, dong: str | None = None) -> str:
+        """집계 키 (단지|청구월 또는 단지|청구월|동)."""
+        return f"{complex_key}|{period}" + (f"|{dong}" if dong else "")
+
+    def get(self, key: str) -> Rollup:
+        """집계 단위 조회."""
+        return Rollup(self.state["rollups"].get(key))
+
+    def add(self, data: dict, complex_key: str | None = None) -> str | None:
+        """세대 결과를 단지/동 집계에 반영 후 저장. 반영된 단지 키 반환 (동호 정보가 없으면 반영하지 않고 None)."""
+        dong_ho = data.get("dong_ho", "")
+        if not dong_ho:
+            # 세대를 구분할 수 없으면 다른 세대 값을 덮어쓰게 되므로 집계하지 않음
+            return None
+        complex_key = data.get("complex") or complex_key or default_complex_key()
+        year, month = billing_period(data)
+        period = f"{year}.{month:02d}"
+        dong = dong_ho[:4].lstrip("0") if len(dong_ho) >= 8 else ""
+        values = household_values(data)
+
+        keys = [self.key(complex_key, period)]
+        if dong:
+            keys.append(self.key(complex_key, period, dong))
+        for key in keys:
+            rollup = self.get(key)
+            rollup.update(dong_ho, values)
+            self.state["rollups"][key] = rollup.to_state()
+        self.save()
+        return keys[0]
+
+    def summary(self, complex_key: str, period: str) -> dict:
+        """단지 월 요약 (단지 통계 + 동별 총액 통계)."""
+        prefix = self.key(complex_key, period)
+        dongs = {}
+        for key in sorted(self.state["rollups"]):
+            if key.startswith(prefix + "|"):
+                stats = self.get(key).stats()
+                if "amount" in stats:
+                    dongs[key.rsplit("|", 1)[1]] = stats["amount"]
+        return {
+            "complex": complex_key,
+            "period": period,
+            "stats": self.get(prefix).stats(),
+            "dongs": dongs,
+        }
+
+    def periods(self) -> list[tuple[str, str]]:
+        """집계가 있는 (단지, 청구월) 목록."""
+        pairs = {tuple(key.split("|")[:2]) for key in self.state["rollups"]}
+        return sorted(pairs)
@@ -0,0 +1,70 @@
+"""브라우저 프로세스 트리 RSS 측정 (Linux /proc 기반)."""
+
+import os
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _read_proc(pid: int, name: str) -> str:
+    """/proc/<pid>/<name> 읽기 (없으면 빈 문자열)."""
+    try:
+        with open(f"/proc/{pid}/{name}", "rb") as f:
+            return f.read().decode("utf-8", "replace")
+    except OSError:
+        return ""
+
+
+def _process_table() -> dict[int, tuple[int, int]]:
+    """{pid: (ppid, rss_bytes)} 테이블 구성."""
+    table = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        stat = _read_proc(int(entry), "stat")
+        if not stat:
+            continue
+        # comm 필드에 공백/괄호가 있을 수 있으므로 마지막 ')' 이후를 파싱
+        fields = stat[stat.rfind(")") + 2:].split()
+        try:
+            table[int(entry)] = (int(fields[1]), int(fields[21]) * _PAGE_SIZE)
+        except (IndexError, ValueError):
+            continue
+    return table
+
+
+def find_pid_by_marker(marker: str) -> int | None:
+    """커맨드라인에 marker 가 포함된 최상위 프로세스 PID 검색."""
+    if not os.path.isdir("/proc"):
+        return None
+    candidates = {
+        int(entry)
+        for entry in os.listdir("/proc")
+        if entry.isdigit() and marker in _read_proc(int(entry), "cmdline").replace("\0", " ")
+    }
+    if not candidates:
+        return None
+    table = _process_table()
+    # 자식 프로세스가 스위치를 물려받는 경우를 대비해 부모가 후보가 아닌 PID 선택
+    roots = [pid for pid in candidates if table.get(pid, (0, 0))[0] not in candidates]
+    return min(roots or candidates)
+
+
+def process_tree_rss(root_pid: int) -> int | None:
+    """root_pid 와 모든 자손 프로세스의 RSS 합계 (bytes). 측정 불가 시 None."""
+    if not os.path.isdir("/proc"):
+        return None
+    table = _process_table()
+    if root_pid not in table:
+        return None
+
+    children: dict[int, list[int]] = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += table[pid][1]
+        stack.extend(children.get(pid, []))
+    return total
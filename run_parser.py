@@ -6,8 +6,6 @@ import os
 import sys
 from datetime import datetime
 
-from apti_parser import APTiParser
-
 
 async def main():
     """메인 함수."""
@@ -21,7 +19,9 @@ async def main():
         print("예시: set APTI_USER_ID=your_id && set APTI_PASSWORD=your_password")
         sys.exit(1)
 
-    # APT.i 데이터 파싱
+    # APT.i 데이터 파싱 (playwright는 환경 변수 확인 이후에 로드)
+    from apti_parser import APTiParser
+
     print("=== APT.i 데이터 수집 시작 ===")
     parser = APTiParser(user_id, password)
     data = await parser.run()
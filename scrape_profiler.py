@@ -0,0 +1,177 @@
+"""수집 실행 프로파일러 (네트워크 워터폴 + CDP Performance 지표 + Playwright tracing)."""
+
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+
+class ScrapeProfiler:
+    """요청/응답 타이밍, 섹션별 성능 지표, tracing 파일을 실행 단위로 기록."""
+
+    def __init__(self, output_dir: str = "profiles", tracing: bool = True) -> None:
+        """초기화."""
+        self.output_dir = output_dir
+        self.tracing = tracing
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.requests: list[dict] = []
+        self.sections: list[dict] = []
+        self._section = "init"
+        self._extract_ms = 0.0
+        self._context = None
+        self._cdp = None
+
+    async def attach(self, context, page) -> None:
+        """context/page 에 이벤트 리스너, CDP 세션, tracing 연결."""
+        self._context = context
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_failed)
+        self._cdp = await context.new_cdp_session(page)
+        await self._cdp.send("Performance.enable")
+        if self.tracing:
+            await context.tracing.start(screenshots=False, snapshots=True)
+
+    def record_extract(self, meta: dict) -> None:
+        """주입 스크립트의 페이지 내부 추출 시간(__meta) 기록 (현재 섹션에 합산)."""
+        self._extract_ms += meta.get("elapsed_ms") or 0
+
+    def _record(self, request, **extra) -> dict:
+        """요청 공통 필드 기록."""
+        timing = request.timing
+        start = timing.get("startTime", time.time() * 1000)
+        end = timing.get("responseEnd", -1)
+        entry = {
+            "section": self._section,
+            "url": request.url[:300],
+            "host": urlparse(request.url).hostname or "",
+            "type": request.resource_type,
+            "method": request.method,
+            "start_ms": start,
+            "duration_ms": round(end, 1) if end >= 0 else None,
+            "ttfb_ms": round(timing["responseStart"], 1) if timing.get("responseStart", -1) >= 0 else None,
+        }
+        entry.update(extra)
+        self.requests.append(entry)
+        return entry
+
+    async def _on_finished(self, request) -> None:
+        """요청 완료 (상태 코드, 전송 크기 포함)."""
+        entry = self._record(request)
+        try:
+            response = await request.response()
+            sizes = await request.sizes()
+            entry["status"] = response.status if response else None
+            entry["bytes"] = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception:
+            entry["status"] = None
+            entry["bytes"] = 0
+
+    def _on_failed(self, request) -> None:
+        """요청 실패."""
+        self._record(request, status=None, bytes=0, failure=request.failure)
+
+    async def _metrics(self) -> dict:
+        """CDP Performance.getMetrics 결과를 dict 로 변환."""
+        if not self._cdp:
+            return {}
+        try:
+            result = await self._cdp.send("Performance.getMetrics")
+        except Exception:
+            return {}
+        return {m["name"]: m["value"] for m in result.get("metrics", [])}
+
+    @asynccontextmanager
+    async def section(self, name: str, attempt: int = 1):
+        """섹션 구간 측정 (소요 시간, 지표 변화량, tracing chunk - 재시도마다 별도 파일)."""
+        self._section = name
+        self._extract_ms = 0.0
+        before = await self._metrics()
+        if self.tracing and self._context:
+            await self._context.tracing.start_chunk(title=f"{name} #{attempt}")
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            trace_path = None
+            if self.tracing and self._context:
+                trace_path = os.path.join(self.output_dir, f"{self.run_id}_{name}_{attempt}.trace.zip")
+                os.makedirs(self.output_dir, exist_ok=True)
+                await self._context.tracing.stop_chunk(path=trace_path)
+            after = await self._metrics()
+            keys = ("ScriptDuration", "LayoutDuration", "RecalcStyleDuration", "TaskDuration", "JSHeapUsedSize", "Nodes")
+            self.sections.append({
+                "name": name,
+                "attempt": attempt,
+                "elapsed_ms": round(elapsed, 1),
+                "extract_ms": round(self._extract_ms, 1),
+                "error": error,
+                "trace": trace_path,
+                "metrics": {k: round(after.get(k, 0) - before.get(k, 0), 4) for k in keys if k in after},
+            })
+            self._section = "between"
+
+    def critical_path(self, section: str) -> list[dict]:
+        """섹션의 임계 경로 추정: 마지막에 끝난 요청부터, 시작 전에 끝난 요청을 거꾸로 연결."""
+        done = [r for r in self.requests if r["section"] == section and r["duration_ms"] is not None]
+        if not done:
+            return []
+        end = lambda r: r["start_ms"] + r["duration_ms"]  # noqa: E731
+        path = [max(done, key=end)]
+        while True:
+            prior = [r for r in done if end(r) <= path[-1]["start_ms"]]
+            if not prior:
+                break
+            path.append(max(prior, key=end))
+        return list(reversed(path))
+
+    def host_totals(self) -> list[dict]:
+        """호스트별 요청 수/전송량/누적 시간 (차단 대상 판단용)."""
+        totals = defaultdict(lambda: {"requests": 0, "bytes": 0, "duration_ms": 0.0})
+        for r in self.requests:
+            t = totals[r["host"]]
+            t["requests"] += 1
+            t["bytes"] += r.get("bytes") or 0
+            t["duration_ms"] += r["duration_ms"] or 0
+        return sorted(({"host": h, **t} for h, t in totals.items()), key=lambda t: -t["duration_ms"])
+
+    def write(self) -> str:
+        """실행 결과를 압축 JSON 파일로 저장."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{self.run_id}_profile.json")
+        artifact = {
+            "run_id": self.run_id,
+            "sections": self.sections,
+            "hosts": self.host_totals(),
+            "requests": self.requests,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+        return path
+
+    def print_summary(self, top: int = 10) -> None:
+        """느린 리소스 및 섹션별 임계 경로 요약 출력."""
+        print("\n=== 프로파일 요약 ===")
+        for s in self.sections:
+            script = s["metrics"].get("ScriptDuration", 0) * 1000
+            attempt = f" #{s['attempt']}" if s["attempt"] > 1 else ""
+            print(f"[{s['name']}{attempt}] {s['elapsed_ms']:.0f}ms (script {script:.0f}ms, 추출 {s['extract_ms']:.0f}ms)"
+                  f"{' ERROR' if s['error'] else ''}")
+            for r in self.critical_path(s["name"]):
+                print(f"   → {r['duration_ms']:>7.0f}ms {r['type']:<10} {r['url'][:90]}")
+
+        print(f"\n느린 리소스 Top {top}:")
+        slowest = sorted((r for r in self.requests if r["duration_ms"] is not None), key=lambda r: -r["duration_ms"])
+        for r in slowest[:top]:
+            print(f"   {r['duration_ms']:>7.0f}ms {(r.get('bytes') or 0) / 1024:>7.1f}KB [{r['section']}] {r['url'][:90]}")
+
+        print("\n호스트별 누적:")
+        for h in self.host_totals()[:top]:
+            print(f"   {h['host']:<50} {h['requests']:>3}건 {h['bytes'] / 1024:>8.1f}KB {h['duration_ms']:>8.0f}ms")
@@ -0,0 +1,368 @@
+"""계정 목록을 여러 프로세스로 나누어 수집 (워커 프로세스별 브라우저/이벤트 루프).
+
+워커는 공유 큐에서 계정을 하나씩 가져가므로(work-stealing) 느린 계정이 한 워커에 몰려도
+다른 워커가 나머지를 처리한다. 결과와 지표는 부모 프로세스에서 집계한다.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from queue import Empty
+
+
+def load_manifest(path: str) -> list[dict]:
+    """계정 목록 JSON 로드.
+
+    형식: [{"name": "101동", "user_id": "...", "password": "..." 또는 "password_env": "환경변수명"}, ...]
+    """
+    with open(path, encoding="utf-8") as f:
+        accounts = json.load(f)
+    for i, account in enumerate(accounts):
+        if "password" not in account and account.get("password_env"):
+            account["password"] = os.environ.get(account["password_env"], "")
+        if not account.get("user_id") or not account.get("password"):
+            raise ValueError(f"manifest {i}번째 계정에 user_id/password 가 없습니다.")
+        account.setdefault("name", f"account-{i}")
+    return accounts
+
+
+def _marker_rss_mb(marker: str) -> float | None:
+    """marker 스위치로 실행한 브라우저 프로세스 트리 RSS (MB)."""
+    from rss_monitor import find_pid_by_marker, process_tree_rss
+
+    pid = find_pid_by_marker(marker)
+    rss = process_tree_rss(pid) if pid else None
+    return rss / (1024 * 1024) if rss is not None else None
+
+
+class _BrowserSlot:
+    """워커의 공유 브라우저 (RSS 상한 초과 시 사용 중인 작업이 모두 끝난 뒤 재시작)."""
+
+    def __init__(self, playwright, profile: str, rss_budget_mb: int | None, contexts: int = 1) -> None:
+        self.playwright = playwright
+        self.profile = profile
+        self.rss_budget_mb = rss_budget_mb
+        self.contexts = contexts
+        self.marker = f"--apti-worker={uuid.uuid4().hex}"
+        self.browser = None
+        self.active = 0
+        self.recycles = 0
+        self._recycling = False
+        self._cond = asyncio.Condition()
+
+    async def start(self) -> None:
+        from apti_parser import launch_browser
+
+        self.browser = await launch_browser(self.playwright, self.profile, (self.marker,), self.contexts)
+
+    def rss_mb(self) -> float | None:
+        return _marker_rss_mb(self.marker)
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._recycling)
+            self.active += 1
+            return self.browser
+
+    async def release(self) -> None:
+        async with self._cond:
+            self.active -= 1
+            if self.rss_budget_mb and not self._recycling:
+                rss = self.rss_mb()
+                self._recycling = rss is not None and rss > self.rss_budget_mb
+            if self._recycling and self.active == 0:
+                await self.browser.close()
+                await self.start()
+                self.recycles += 1
+                self._recycling = False
+                self._cond.notify_all()
+
+
+class _ProfileSlot:
+    """동시 수집 슬롯 하나의 영구 프로필 context.
+
+    슬롯의 계정들은 순서대로 같은 context 를 쓰고(쿠키만 계정마다 교체), RSS 상한을 넘으면
+    계정 사이에 context 를 재시작한다. 캐시는 프로필 디렉터리에 남는다.
+    """
+
+    def __init__(self, playwright, path: str, profile: str, cache_mb: int, rss_budget_mb: int | None) -> None:
+        self.playwright = playwright
+        self.path = path
+        self.profile = profile
+        self.cache_mb = cache_mb
+        self.rss_budget_mb = rss_budget_mb
+        self.marker = f"--apti-worker={uuid.uuid4().hex}"
+        self.context = None
+        self.recycles = 0
+
+    async def start(self) -> None:
+        from apti_parser import launch_persistent
+        from browser_cache import prune_profile
+
+        pruned = prune_profile(self.path, self.cache_mb)
+        if pruned:
+            print(f"브라우저 캐시 정리: {pruned['removed']}개 파일, {pruned['freed_mb']}MB 삭제 (현재 {pruned['size_mb']}MB)")
+        self.context = await launch_persistent(self.playwright, self.path, self.profile, (self.marker,), self.cache_mb)
+
+    async def acquire(self):
+        """context 반환 (첫 계정에서 실행 - 계정을 받지 못한 슬롯은 브라우저를 띄우지 않음)."""
+        if self.context is None:
+            await self.start()
+        return self.context
+
+    async def release(self) -> None:
+        if self.context is None or not self.rss_budget_mb:
+            return
+        rss = _marker_rss_mb(self.marker)
+        if rss is not None and rss > self.rss_budget_mb:
+            await self.context.close()
+            await self.start()
+            self.recycles += 1
+
+    async def close(self) -> None:
+        if self.context:
+            await self.context.close()
+            self.context = None
+
+
+async def _scrape_account(
+    account: dict, slot: _BrowserSlot, options: dict, worker_id: int, profile_slot: _ProfileSlot | None = None
+) -> dict:
+    """계정 1건 수집 (profile_slot 지정 시 공유 브라우저 대신 슬롯의 영구 프로필 context 사용)."""
+    from apti_parser import APTiParser
+
+    started = time.perf_counter()
+    browser = None if profile_slot else await slot.acquire()
+    deadline = None
+    if options["deadline"]:
+        from deadline import DEFAULT_WEIGHTS, Deadline
+
+        # Notion 전송은 수집이 끝난 뒤 부모 프로세스에서 하므로 계정 예산에서 제외
+        deadline = Deadline(options["deadline"], {k: w for k, w in DEFAULT_WEIGHTS.items() if k != "notion"})
+    error = None
+    data = None
+    parser = None
+    try:
+        context = await profile_slot.acquire() if profile_slot else None
+        parser = APTiParser(
+            account["user_id"],
+            account["password"],
+            profile=options["profile"],
+            section_retries=options["section_retries"],
+            browser=browser,
+            full_refresh=options["full_refresh"],
+            user_data_dir=profile_slot.path if profile_slot else None,
+            cache_mb=options["cache_mb"],
+            context=context,
+            deadline=deadline,
+        )
+        data = await parser.run()
+        if data and account.get("complex"):
+            data["complex"] = account["complex"]
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if browser:
+            await slot.release()
+        if profile_slot:
+            await profile_slot.release()
+    return {
+        "name": account["name"],
+        "worker": worker_id,
+        "pid": os.getpid(),
+        "ok": bool(data) and not data.get("failed_sections"),
+        "elapsed_s": round(time.perf_counter() - started, 2),
+        "failed_sections": (data or {}).get("failed_sections", []),
+        "error": error or (None if data else "로그인/수집 실패"),
+        "data": data,
+        # 동시 수 조절용 사이트 상태 지표
+        "latency_ms": round(statistics.median(parser.document_ms), 1) if parser and parser.document_ms else None,
+        "http_errors": parser.http_errors if parser else 0,
+        "login_ok": parser.login_ok if parser else None,
+        "deadline": deadline.summary() if deadline else None,
+    }
+
+
+async def _worker_loop(worker_id: int, queue, options: dict) -> dict:
+    """워커: 브라우저 1개를 띄우고 큐가 빌 때까지 계정 처리.
+
+    adaptive 면 AIMD 제어기가 워커 내 동시 수집 수를 per_worker ~ max_per_worker 사이에서 조절한다.
+    persistent 면 동시 수집 슬롯마다 영구 프로필(worker<N>-<슬롯>) context 를 하나씩 띄워 두고
+    계정을 순서대로 처리해 캐시는 실행 간 재사용하고 쿠키는 계정마다 교체한다.
+    """
+    from playwright.async_api import async_playwright
+
+    from browser_cache import user_data_dir
+    from concurrency import AimdController
+
+    started = time.perf_counter()
+    results: list[dict] = []
+    if options["adaptive"]:
+        controller = AimdController(
+            initial=options["per_worker"],
+            max_limit=options["max_per_worker"],
+            latency_target_ms=options["latency_target_ms"],
+        )
+    else:
+        controller = AimdController(initial=options["per_worker"], max_limit=options["per_worker"])
+    async with async_playwright() as playwright:
+        # 동시 수집 계정들이 이 브라우저의 context 를 나눠 씀 (adaptive 면 상한까지)
+        slot = _BrowserSlot(playwright, options["profile"], options["rss_budget_mb"], controller.max_limit)
+        if not options["persistent"]:
+            await slot.start()
+        profile_slots: list[_ProfileSlot] = []
+
+        async def consume(index: int) -> None:
+            profile_slot = None
+            if options["persistent"]:
+                profile_slot = _ProfileSlot(
+                    playwright,
+                    user_data_dir(f"worker{worker_id}-{index}"),
+                    options["profile"],
+                    options["cache_mb"],
+                    options["rss_budget_mb"],
+                )
+                profile_slots.append(profile_slot)
+            while True:
+                await controller.acquire()
+                try:
+                    account = queue.get_nowait()
+                except Empty:
+                    await controller.abandon()
+                    return
+                result = await _scrape_account(account, slot, options, worker_id, profile_slot)
+                results.append(result)
+                await controller.release(
+                    result["latency_ms"],
+                    result["ok"] and not result["http_errors"],
+                    result["login_ok"],
+                )
+
+        try:
+            await asyncio.gather(*(consume(i) for i in range(controller.max_limit)))
+        finally:
+            for profile_slot in profile_slots:
+                await profile_slot.close()
+        if slot.browser:
+            await slot.browser.close()
+
+    return {
+        "results": results,
+        "metrics": {
+            "worker": worker_id,
+            "pid": os.getpid(),
+            "accounts": len(results),
+            "wall_s": round(time.perf_counter() - started, 2),
+            "busy_s": round(sum(r["elapsed_s"] for r in results), 2),
+            "recycles": slot.recycles + sum(s.recycles for s in profile_slots),
+            "concurrency": controller.metrics(),
+        },
+    }
+
+
+def _worker_main(worker_id: int, queue, options: dict) -> dict:
+    """워커 프로세스 진입점 (프로세스마다 독립된 이벤트 루프)."""
+    return asyncio.run(_worker_loop(worker_id, queue, options))
+
+
+def run_sharded(
+    accounts: list[dict],
+    workers: int | None = None,
+    per_worker: int = 1,
+    profile: str = "lowmem",
+    rss_budget_mb: int | None = None,
+    section_retries: int = 2,
+    adaptive: bool = False,
+    max_per_worker: int = 4,
+    latency_target_ms: float | None = None,
+    full_refresh: bool = False,
+    persistent: bool = False,
+    cache_mb: int = 64,
+    deadline: float | None = None,
+) -> dict:
+    """계정 목록을 워커 프로세스들로 분산 수집하고 결과/지표 집계.
+
+    adaptive: 워커별 AIMD 제어기로 동시 수집 수 자동 조절 (per_worker 에서 시작, max_per_worker 까지)
+    persistent: 슬롯별 영구 브라우저 프로필 사용 (cache_mb: 프로필당 캐시 상한)
+    deadline: 계정 1건당 시간 예산(초) - 계정마다 새 Deadline 으로 단계별 배분
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(accounts)))
+    options = {
+        "per_worker": per_worker,
+        "adaptive": adaptive,
+        "max_per_worker": max(per_worker, max_per_worker),
+        "latency_target_ms": latency_target_ms,
+        "full_refresh": full_refresh,
+        "persistent": persistent,
+        "cache_mb": cache_mb,
+        "profile": profile,
+        "rss_budget_mb": rss_budget_mb,
+        "section_retries": section_retries,
+        "deadline": deadline,
+    }
+    # playwright 는 fork 이후 안전하지 않으므로 spawn 사용
+    ctx = multiprocessing.get_context("spawn")
+    started = time.perf_counter()
+    results: list[dict] = []
+    worker_metrics: list[dict] = []
+
+    with ctx.Manager() as manager:
+        queue = manager.Queue()
+        for account in accounts:
+            queue.put(account)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {pool.submit(_worker_main, i, queue, options): i for i in range(workers)}
+            for future in as_completed(futures):
+                try:
+                    out = future.result()
+                except Exception as e:
+                    # 워커가 비정상 종료되면 처리 중이던 계정은 결과 없이 누락됨
+                    worker_metrics.append({"worker": futures[future], "error": f"{type(e).__name__}: {e}"})
+                    continue
+                results.extend(out["results"])
+                worker_metrics.append(out["metrics"])
+
+    wall = time.perf_counter() - started
+    ok = sum(1 for r in results if r["ok"])
+    done = {r["name"] for r in results}
+    return {
+        "summary": {
+            "accounts": len(accounts),
+            "ok": ok,
+            "failed": len(results) - ok,
+            "missing": [a["name"] for a in accounts if a["name"] not in done],
+            "workers": workers,
+            "per_worker": per_worker,
+            "adaptive": adaptive,
+            "wall_s": round(wall, 2),
+            "accounts_per_min": round(len(results) / wall * 60, 2) if wall else 0.0,
+        },
+        "workers": sorted(worker_metrics, key=lambda m: m["worker"]),
+        "results": results,
+    }
+
+
+def print_shard_summary(report: dict) -> None:
+    """집계 결과 출력."""
+    s = report["summary"]
+    print("\n=== 분산 수집 결과 ===")
+    print(f"계정 {s['accounts']}건: 성공 {s['ok']} / 실패 {s['failed']} / 누락 {len(s['missing'])}")
+    print(f"워커 {s['workers']}개 × {s['per_worker']}, {s['wall_s']:.1f}s ({s['accounts_per_min']:.1f}건/분)")
+    for m in report["workers"]:
+        if "error" in m:
+            print(f"   - worker {m['worker']}: 오류 {m['error']}")
+        else:
+            print(f"   - worker {m['worker']} (pid {m['pid']}): {m['accounts']}건, "
+                  f"busy {m['busy_s']:.1f}s / wall {m['wall_s']:.1f}s, 재시작 {m['recycles']}회")
+            if s["adaptive"]:
+                c = m["concurrency"]
+                steps = " → ".join(f"{h['limit']}({h['reason']})" for h in c["history"])
+                print(f"     동시 수 {c['limit']} (최대 {c['max_limit_reached']}, 감소 {c['decreases']}회): {steps}")
+    for r in report["results"]:
+        if not r["ok"]:
+            print(f"   ❌ {r['name']}: {r['error'] or ', '.join(r['failed_sections'])}")
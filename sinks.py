@@ -0,0 +1,233 @@
+"""수집 결과 출력 대상(sink) - JSON 파일, 로컬 이력 DB, CSV, Notion.
+
+모든 sink 는 같은 결과를 받아 동시에 실행되며, 한 sink 의 실패가 다른 sink 에 영향을 주지 않는다.
+"""
+
+import abc
+import asyncio
+import csv
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from billing import billing_period, parse_amount
+from checkpoint import STATE_DIR
+
+
+class Sink(abc.ABC):
+    """출력 대상 기본 클래스."""
+
+    name = "sink"
+
+    @abc.abstractmethod
+    def write(self, data: dict) -> str:
+        """결과 기록 후 위치/요약 문자열 반환 (실패 시 예외)."""
+
+
+class JsonFileSink(Sink):
+    """수집 결과를 JSON 파일로 저장."""
+
+    name = "json"
+
+    def __init__(self, path: str | None = None) -> None:
+        """초기화 (path 미지정 시 apti_result_<시각>.json)."""
+        self.path = path
+
+    def write(self, data: dict) -> str:
+        path = self.path or f"apti_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return f"{path} ({os.path.getsize(path)} bytes)"
+
+
+class HistoryDbSink(Sink):
+    """월별 청구 요약과 납부 내역을 로컬 SQLite 이력 DB에 누적."""
+
+    name = "history"
+
+    def __init__(self, path: str | None = None) -> None:
+        """초기화."""
+        self.path = path or os.path.join(STATE_DIR, "history.sqlite3")
+
+    def connect(self) -> sqlite3.Connection:
+        """DB 연결 (테이블 없으면 생성)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS bills (
+                dong_ho TEXT NOT NULL,
+                period TEXT NOT NULL,
+                amount INTEGER,
+                status TEXT,
+                deadline TEXT,
+                scraped_at TEXT,
+                data TEXT,
+                PRIMARY KEY (dong_ho, period)
+            );
+            CREATE TABLE IF NOT EXISTS payments (
+                dong_ho TEXT NOT NULL,
+                date TEXT NOT NULL,
+                billing_month TEXT NOT NULL,
+                amount INTEGER NOT NULL,
+                bank TEXT,
+                method TEXT,
+                status TEXT,
+                PRIMARY KEY (dong_ho, date, billing_month, amount)
+            );
+        """)
+        return conn
+
+    def write(self, data: dict) -> str:
+        year, month = billing_period(data)
+        period = f"{year}.{month:02d}"
+        dong_ho = data.get("dong_ho", "")
+        payment = data.get("maint_payment", {})
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO bills VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    dong_ho,
+                    period,
+                    parse_amount(payment.get("amount")),
+                    payment.get("status", ""),
+                    payment.get("deadline", ""),
+                    data.get("timestamp", ""),
+                    json.dumps(data, ensure_ascii=False),
+                ),
+            )
+            inserted = 0
+            for h in data.get("payment_history", []):
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO payments VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        dong_ho,
+                        h.get("date", ""),
+                        h.get("billing_month", ""),
+                        parse_amount(h.get("amount")),
+                        h.get("bank", ""),
+                        h.get("method", ""),
+                        h.get("status", ""),
+                    ),
+                )
+                inserted += cursor.rowcount
+        conn.close()
+        return f"{self.path} ({period}, 납부내역 {inserted}건 추가)"
+
+
+class CsvSink(Sink):
+    """월별 요약 한 줄씩 CSV 파일에 추가."""
+
+    name = "csv"
+    FIELDS = ["scraped_at", "dong_ho", "period", "amount", "status", "deadline", "전기", "수도", "난방", "가스", "온수"]
+
+    def __init__(self, path: str = "apti_history.csv") -> None:
+        """초기화."""
+        self.path = path
+
+    def write(self, data: dict) -> str:
+        year, month = billing_period(data)
+        payment = data.get("maint_payment", {})
+        row = {
+            "scraped_at": data.get("timestamp", ""),
+            "dong_ho": data.get("dong_ho", ""),
+            "period": f"{year}.{month:02d}",
+            "amount": parse_amount(payment.get("amount")),
+            "status": payment.get("status", ""),
+            "deadline": payment.get("deadline", ""),
+        }
+        for energy in data.get("energy_category", []):
+            if energy.get("type") in self.FIELDS:
+                row[energy["type"]] = parse_amount(energy.get("cost"))
+
+        is_new = not os.path.exists(self.path)
+        # Excel 에서 한글이 깨지지 않도록 BOM 포함
+        with open(self.path, "a", encoding="utf-8-sig" if is_new else "utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            if is_new:
+                writer.writeheader()
+            writer.writerow(row)
+        return f"{self.path} ({row['period']})"
+
+
+class NotionSink(Sink):
+    """Notion 대시보드 페이지 생성 (같은 청구월이 있으면 건너뜀)."""
+
+    name = "notion"
+
+    def __init__(self, token: str, database_id: str, force: bool = False, **sender_options) -> None:
+        """초기화 (sender_options: NotionSender 옵션 - timeout_ms, render_mode 등)."""
+        from notion_sender import NotionSender
+
+        self.sender = NotionSender(token, database_id, **sender_options)
+        self.force = force
+
+    def write(self, data: dict) -> str:
+        year, month = billing_period(data)
+        if not self.force and self.sender.check_month_exists(year, month):
+            return f"{year}년 {month}월 이미 존재 (건너뜀)"
+        if not self.sender.update_or_create_page(data):
+            raise RuntimeError("Notion 페이지 생성 실패")
+        return f"{year}년 {month}월 페이지 생성"
+
+
+class RollupSink(Sink):
+    """단지/동 월 집계에 세대 결과를 증분 반영 (게시는 cli.py rollup --publish)."""
+
+    name = "rollup"
+
+    def __init__(self, path: str | None = None, complex_key: str | None = None) -> None:
+        """초기화."""
+        from rollups import RollupStore
+
+        self.store = RollupStore(path)
+        self.complex_key = complex_key
+
+    def write(self, data: dict) -> str:
+        key = self.store.add(data, self.complex_key)
+        if key is None:
+            return "동호 정보 없음, 집계 건너뜀"
+        amount = self.store.get(key).stats().get("amount", {})
+        return f"{key} (세대 {amount.get('n', 0)}곳, 중앙값 {amount.get('median', 0):,.0f}원)"
+
+
+SINK_TYPES = {
+    "json": JsonFileSink,
+    "history": HistoryDbSink,
+    "csv": CsvSink,
+    "notion": NotionSink,
+    "rollup": RollupSink,
+}
+
+
+def _write_timed(sink: Sink, data: dict) -> dict:
+    """sink 하나 실행 (예외는 결과로 변환)."""
+    started = time.perf_counter()
+    try:
+        detail = sink.write(data)
+        ok, error = True, None
+    except Exception as e:
+        detail, ok, error = None, False, f"{type(e).__name__}: {e}"
+    return {
+        "sink": sink.name,
+        "ok": ok,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "detail": detail,
+        "error": error,
+    }
+
+
+async def run_sinks(sinks: list[Sink], data: dict) -> list[dict]:
+    """모든 sink 를 스레드에서 동시에 실행하고 sink 별 결과/소요 시간 반환."""
+    return list(await asyncio.gather(*(asyncio.to_thread(_write_timed, sink, data) for sink in sinks)))
+
+
+def print_sink_results(results: list[dict]) -> None:
+    """sink 실행 결과 출력."""
+    print("\n=== 출력 결과 ===")
+    for r in results:
+        mark = "✅" if r["ok"] else "❌"
+        print(f"{mark} {r['sink']:<8} {r['elapsed_ms']:>8.1f}ms  {r['detail'] or r['error']}")